@@ -1,13 +1,11 @@
-import os
+from functools import lru_cache
+from pathlib import Path
 
-from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# .env 파일 경로 (프로젝트 루트 기준)
-env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".env")
-print(f".env path: {env_path}")
-load_dotenv(dotenv_path=env_path)
+# .env 파일 경로 (프로젝트 루트 기준, 모듈 로드 시 한 번만 계산)
+_ENV_PATH = Path(__file__).resolve().parents[2] / ".env"
 
 
 class Settings(BaseSettings):
@@ -40,8 +38,63 @@ class Settings(BaseSettings):
         alias="ENABLE_SPEAKER_DIARIZATION",
         description="화자 분리 활성화"
     )
+    speech_max_concurrency: int = Field(
+        default=4,
+        alias="SPEECH_MAX_CONCURRENCY",
+        description="업로드 파일 인식 시 동시에 보낼 수 있는 Speech API 요청 수"
+    )
+    speech_max_rps: float = Field(
+        default=10.0,
+        alias="SPEECH_MAX_RPS",
+        description="업로드 파일 인식 시 Speech API 초당 요청 수 상한 (분당 900회 할당량 기준)"
+    )
+    speech_gcs_bucket: str = Field(
+        default="",
+        alias="SPEECH_GCS_BUCKET",
+        description="10MB를 넘는 업로드 오디오를 long_running_recognize로 처리할 때 사용할 GCS 버킷"
+    )
+    speech_audio_queue_max: int = Field(
+        default=32,
+        alias="SPEECH_AUDIO_QUEUE_MAX",
+        description="Speech API로 보내기 전 대기할 수 있는 오디오 청크 수"
+    )
+
+    # Sheets API 호출 속도 제한 (사용자당 분당 60회 할당량 기준)
+    sheets_rate_capacity: int = Field(
+        default=10,
+        alias="SHEETS_RATE_CAPACITY",
+        description="Sheets API 순간 최대 연속 호출 수"
+    )
+    sheets_rate_per_sec: float = Field(
+        default=1.0,
+        alias="SHEETS_RATE_PER_SEC",
+        description="Sheets API 초당 호출 수 상한"
+    )
+
+    # WebSocket 세션 메모리 상한
+    ws_max_sessions: int = Field(
+        default=1024,
+        alias="WS_MAX_SESSIONS",
+        description="동시에 유지할 수 있는 WebSocket 녹음 세션 수"
+    )
+
+    # .env는 pydantic-settings가 한 번만 읽음 (load_dotenv 중복 파싱 제거)
+    # 정의되지 않은 변수(예: 이전 버전의 OPENAI_API_KEY)가 .env에 남아 있어도 무시
+    model_config = SettingsConfigDict(
+        env_file=_ENV_PATH,
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """프로세스당 한 번만 생성되는 Settings 인스턴스 반환"""
+    return Settings()
 
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
+settings = get_settings()
 
-settings = Settings()
+# Google 클라이언트 라이브러리(ADC)는 os.environ만 보므로 .env의 자격 증명 경로를 환경 변수로 노출
+if settings.google_application_credentials:
+    os.environ.setdefault("GOOGLE_APPLICATION_CREDENTIALS", settings.google_application_credentials)
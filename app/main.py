@@ -1,9 +1,63 @@
+import asyncio
+import atexit
+import logging
+import queue
+import sys
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from app.config.settings import settings
 from app.routers import transcribe_router, websocket_router
+from app.services.sheets_service import sheets_service
+from app.services.transcribe_service import transcribe_service
+
+
+def _configure_logging() -> None:
+    """
+    app.* 로거 설정
+
+    로그 레코드는 큐에만 넣고 실제 출력은 별도 스레드(QueueListener)가 담당하므로
+    이벤트 루프가 stdout/stderr 쓰기에 막히지 않습니다.
+    """
+    app_logger = logging.getLogger("app")
+    if app_logger.handlers:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.setLevel(settings.app_log_level.upper())
+
+
+_configure_logging()
 
-app = FastAPI(title="Meeting Transcriber MVP")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작 시 Google 클라이언트를 미리 준비하여 첫 요청 지연 제거"""
+    await asyncio.gather(
+        sheets_service.prewarm(),
+        transcribe_service.prewarm(),
+    )
+    yield
+
+
+app = FastAPI(
+    title="Meeting Transcriber MVP",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # 모든 JSON 응답을 orjson으로 직렬화
+)
 
 # CORS 설정 (프론트엔드와 통신을 위해 필요)
 app.add_middleware(
@@ -21,3 +75,18 @@ app.include_router(websocket_router.router)
 @app.get("/")
 def root():
     return {"message": "Server running successfully"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop/httptools는 uvicorn[standard]에 포함 (uvloop는 Windows 미지원)
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=settings.app_port,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        log_level=settings.app_log_level,
+    )
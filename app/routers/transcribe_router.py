@@ -1,14 +1,18 @@
+import os
 from datetime import datetime
 
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
 
 from app.config.settings import settings
-from app.models.transcribe import SheetRecord, TranscribeResponse
+from app.models.transcribe import TranscribeResponse
 from app.services.sheets_service import sheets_service
 from app.services.transcribe_service import transcribe_service
 
 router = APIRouter(prefix="/api/v1/transcribe", tags=["Transcribe"])
 
+# 허용되는 오디오 파일 확장자
+_ALLOWED_EXTS = frozenset({".mp3", ".wav", ".m4a", ".flac", ".ogg", ".webm", ".mp4"})
+
 
 @router.get("/ping")
 def ping():
@@ -36,11 +40,8 @@ async def upload_and_transcribe(
     """
     try:
         # 1. 오디오 파일 유효성 검사 (파일 확장자로 확인)
-        allowed_extensions = [".mp3", ".wav", ".m4a", ".flac", ".ogg", ".webm", ".mp4"]
-        file_ext = audio_file.filename.lower()[-4:] if audio_file.filename else ""
-
         is_audio = audio_file.content_type and audio_file.content_type.startswith("audio/")
-        is_allowed_ext = any(file_ext.endswith(ext) for ext in allowed_extensions)
+        is_allowed_ext = os.path.splitext(audio_file.filename or "")[1].lower() in _ALLOWED_EXTS
 
         if not (is_audio or is_allowed_ext):
             raise HTTPException(
@@ -49,8 +50,10 @@ async def upload_and_transcribe(
             )
 
         # 2. 음성 인식 (Google Speech-to-Text API)
+        # UploadFile.read는 디스크로 넘어간 파일을 스레드 풀에서 한 번에 읽음 (추가 복사 없음)
+        audio_content = await audio_file.read()
         transcription = await transcribe_service.transcribe_audio(
-            audio_file.file, language=language, filename=audio_file.filename
+            audio_content, language=language, filename=audio_file.filename
         )
 
         # 3. 화자 이름 설정
@@ -60,15 +63,13 @@ async def upload_and_transcribe(
         now = datetime.now()
 
         # 5. Google Sheets에 저장
-        sheet_record = SheetRecord(
-            timestamp=now.strftime("%Y-%m-%d %H:%M:%S"),
+        row_number = await sheets_service.append_row(
+            timestamp=now.isoformat(sep=" ", timespec="seconds"),  # YYYY-MM-DD HH:MM:SS
             speaker=speaker_name,
             transcription=transcription,
             meeting_title=meeting_title,
         )
 
-        row_number = await sheets_service.append_record(sheet_record)
-
         # 6. 응답 반환
         return TranscribeResponse(
             success=True,
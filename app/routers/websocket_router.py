@@ -1,30 +1,529 @@
-import json
+import asyncio
 import logging
-import uuid
-import base64
+import re
+import secrets
 from datetime import datetime
-from typing import Dict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
 
 from app.config.settings import settings
-from app.models.transcribe import SheetRecord
 from app.services.sheets_service import sheets_service
-from app.services.speech_service import speech_service
+from app.services.speech_service import SpeechStreamingSession, speech_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ws", tags=["WebSocket"])
 
+# 참석자 명단 구분자 ("홍길동, 김철수" → 쉼표와 주변 공백)
+_PARTICIPANT_SEP = re.compile(r"\s*,\s*")
+
+class RecordingSession:
+    """
+    WebSocket 녹음 세션 상태
+
+    오디오 프레임마다 여러 번 접근하므로 dict 대신 __slots__ 클래스로 정의
+    (키 해싱 없이 속성 접근, 세션당 메모리 절감)
+    """
+
+    __slots__ = (
+        "session_id", "language", "speaker", "meeting_title",
+        "transcription_count", "start_time",
+        "sheet_id", "tab_id", "tab_name", "sheet_link", "ready",
+        "pending_rows", "pending_row_count", "flush_lock", "flush_task",
+        "participant_names", "available_names", "speaker_mapping", "last_speaker_id", "last_speaker_name", "unmapped_mask",
+        "stream_index", "pending_labels", "label_timer", "label_task",
+        "speech_session", "speech_callback", "rotation_callback", "speech_started", "audio_queue", "audio_task", "websocket",
+    )
+
+    def __init__(self, session_id: str, websocket: WebSocket):
+        self.session_id = session_id
+        self.language = "ko-KR"
+        self.speaker = settings.default_speaker
+        self.meeting_title: Optional[str] = None
+        self.transcription_count = 0  # 실시간으로 받은 텍스트 조각 수
+        self.start_time: Optional[datetime] = None
+        self.sheet_id: Optional[str] = None  # 템플릿 시트 ID (파일 ID)
+        self.tab_id: Optional[int] = None  # 생성된 탭 ID
+        self.tab_name: Optional[str] = None  # 생성된 탭 이름
+        self.sheet_link: Optional[str] = None  # 탭 링크
+        self.ready = False  # 시트 생성 완료 여부 (sheet_id/tab_name 사용 가능)
+
+        # 실시간 녹취 일괄 기록 버퍼
+        self.pending_rows: List[Tuple[List[str], dict]] = []  # 아직 시트에 기록되지 않은 (행 목록, 확인 메시지)
+        self.pending_row_count = 0  # 버퍼에 쌓인 총 행 수
+        self.flush_lock = asyncio.Lock()  # 기록 순서 보장
+        self.flush_task: Optional[asyncio.Task] = None  # 주기적 기록 태스크
+
+        # 화자 관련
+        self.participant_names: List[str] = []  # 참석자 명단 ["홍길동", "김철수"]
+        self.available_names: List[str] = []  # 아직 매핑되지 않은 참석자 (명단 순서 유지)
+        self.speaker_mapping: Dict[int, str] = {}  # {1: "홍길동", 2: "김철수"}
+        self.last_speaker_id: Optional[int] = None  # 마지막 화자 Speaker ID
+        self.last_speaker_name: Optional[str] = None  # 마지막 화자 이름
+        self.unmapped_mask = 0  # 아직 매핑 안 된 Speaker ID 비트마스크 (bit N = Speaker N)
+        self.stream_index = 0  # Speech 스트림 순번 (교체될 때마다 화자 번호가 새로 매겨짐)
+        self.pending_labels: Dict[str, str] = {}  # 시트에 아직 반영하지 않은 {임시 레이블: 이름}
+        self.label_timer: Optional[asyncio.TimerHandle] = None  # 레이블 반영 디바운스 타이머
+        self.label_task: Optional[asyncio.Task] = None  # 레이블 반영 태스크
+
+        # Speech API 스트리밍 세션 (지속적 연결)
+        self.speech_session: Optional[SpeechStreamingSession] = None
+        self.speech_callback: Optional[Callable[[dict], Awaitable[None]]] = None  # 인식 결과 콜백
+        self.rotation_callback: Optional[Callable[[], Awaitable[None]]] = None  # 스트림 교체 콜백
+        self.speech_started = False  # 스트림 시작 여부 (첫 오디오 도착 시 시작)
+        self.audio_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.speech_audio_queue_max)  # 수신 → Speech 전달 버퍼
+        self.audio_task: Optional[asyncio.Task] = None  # 오디오 전달 태스크
+        self.websocket = websocket  # WebSocket 객체 (콜백에서 사용)
+
+
 # 활성 세션 관리
-active_sessions: Dict[str, dict] = {}
+active_sessions: Dict[str, RecordingSession] = {}
+
+
+async def _send_json(websocket: WebSocket, payload: dict) -> None:
+    """orjson으로 직렬화하여 텍스트 프레임으로 전송 (브라우저의 JSON.parse 호환)"""
+    await websocket.send_text(orjson.dumps(payload).decode())
+
+
+# 실시간 녹취 일괄 기록 설정 (N행이 쌓이거나 T초마다 한 번에 기록)
+_FLUSH_MAX_ROWS = 20
+_FLUSH_INTERVAL_SEC = 2.0
+
+
+async def _enqueue_rows(session: RecordingSession, rows: list, message: dict) -> None:
+    """
+    시트에 기록할 행을 버퍼에 추가
+
+    message는 기록 완료 후 클라이언트에 보낼 확인 메시지이며,
+    텍스트가 기록된 행 번호("row")는 flush 시 채워집니다.
+    """
+    session.pending_rows.append((rows, message))
+    session.pending_row_count += len(rows)
+    if session.pending_row_count >= _FLUSH_MAX_ROWS:
+        await _flush_pending_rows(session)
+
+
+async def _flush_pending_rows(session: RecordingSession) -> None:
+    """버퍼에 쌓인 녹취 행을 한 번의 Sheets API 호출로 기록하고 클라이언트에 확인 전송"""
+    async with session.flush_lock:
+        entries = session.pending_rows
+        if not entries:
+            return
+        session.pending_rows = []
+        session.pending_row_count = 0
+        websocket = session.websocket
+
+        try:
+            first_row = await sheets_service.append_transcription_rows(
+                sheet_id=session.sheet_id,
+                tab_name=session.tab_name,
+                rows=[row for rows, _ in entries for row in rows]
+            )
+        except Exception as e:
+            logger.error(f"실시간 녹취 기록 실패: {str(e)}")
+            await _send_json(websocket, {
+                "type": "error",
+                "message": f"녹취 기록 실패: {str(e)}",
+            })
+            return
+
+        # 클라이언트에 확인 전송 (텍스트가 기록된 행 번호 = 각 묶음의 마지막 행)
+        next_row = first_row
+        for rows, message in entries:
+            next_row += len(rows)
+            message["row"] = next_row - 1
+            await _send_json(websocket, message)
+
+
+async def _flush_periodically(session: RecordingSession) -> None:
+    """녹음 중 일정 간격으로 버퍼를 시트에 기록 (세션 종료 시 취소됨)"""
+    while True:
+        await asyncio.sleep(_FLUSH_INTERVAL_SEC)
+        try:
+            await _flush_pending_rows(session)
+        except Exception as e:
+            logger.error(f"버퍼 기록 실패: session_id={session.session_id}, error={e}")
+
+
+# 화자 매핑이 연달아 들어오면 모아서 한 번에 반영 (마지막 매핑 후 대기 시간)
+_LABEL_DEBOUNCE_SEC = 0.5
+
+
+async def _apply_label_updates(session: RecordingSession) -> None:
+    """모아둔 화자 매핑을 한 번의 batchUpdate로 시트 레이블에 반영"""
+    labels = session.pending_labels
+    if not labels or not session.ready:
+        return
+    session.pending_labels = {}
+
+    try:
+        # 버퍼에 남은 "Speaker N" 행을 먼저 기록해야 치환 대상에 포함됨
+        await _flush_pending_rows(session)
+        await sheets_service.batch_update_speaker_labels(
+            sheet_id=session.sheet_id,
+            tab_id=session.tab_id,
+            labels=labels
+        )
+    except Exception as e:
+        logger.error(f"레이블 업데이트 실패: {e}")
+
+
+def _schedule_label_updates(session: RecordingSession) -> None:
+    """추가 매핑 없이 일정 시간이 지나면 레이블 반영 (새 매핑이 오면 타이머 재설정)"""
+    if session.label_timer is not None:
+        session.label_timer.cancel()
+
+    def apply_now() -> None:
+        session.label_timer = None
+        session.label_task = asyncio.create_task(_apply_label_updates(session))
+
+    session.label_timer = asyncio.get_running_loop().call_later(_LABEL_DEBOUNCE_SEC, apply_now)
+
+
+def _temp_speaker_label(speaker_id: Any, stream_index: int) -> str:
+    """
+    매핑 전 화자의 임시 레이블
+
+    Speech 스트림이 교체되면 화자 번호가 1부터 다시 매겨지므로, 이전 스트림의 같은 번호와
+    시트에서 구분되도록 두 번째 스트림부터는 순번을 붙임 (예: "Speaker 1-2")
+    """
+    if stream_index == 0:
+        return f"Speaker {speaker_id}"
+    return f"Speaker {speaker_id}-{stream_index + 1}"
+
+
+# 오디오 큐에 자리가 나기를 기다리는 최대 시간 (초과하면 Speech 전달이 멈춘 것으로 보고 세션 종료)
+# WEBM_OPUS 청크는 컨테이너의 임의 구간이므로 하나라도 버리면 이후 스트림 전체를 디코딩할 수 없음
+_AUDIO_PUT_TIMEOUT_SEC = 10.0
+
+
+async def _pump_audio(session: RecordingSession) -> None:
+    """오디오 큐의 청크를 Speech 세션으로 전달 (수신 루프가 Speech I/O에 막히지 않도록 분리)"""
+    audio_queue = session.audio_queue
+    while True:
+        audio_bytes = await audio_queue.get()
+        try:
+            await session.speech_session.send_audio(audio_bytes)
+        except Exception:
+            logger.exception("오디오 전달 실패: session_id=%s", session.session_id)
+
+
+async def _handle_start(session: RecordingSession, data: dict) -> None:
+    """녹음 시작: 회의록 시트 생성 후 Speech API 스트리밍 세션 준비"""
+    websocket = session.websocket
+    session_id = session.session_id
+
+    session.language = data.get("language", "ko-KR")
+    session.speaker = data.get("speaker", settings.default_speaker)
+    session.meeting_title = data.get("meeting_title", "제목없음")
+    # 로컬 시간대가 명시된 시각 (세션 조회 시 오프셋 포함)
+    now = datetime.now().astimezone()
+    session.start_time = now
+
+    # 참석자 명단 파싱
+    participants_str = data.get("participants", "")
+    if participants_str:
+        session.participant_names = [
+            name for name in _PARTICIPANT_SEP.split(participants_str.strip()) if name
+        ]
+    session.available_names = list(session.participant_names)
+
+    logger.info(
+        f"녹음 시작: session_id={session_id}, "
+        f"speaker={session.speaker}, "
+        f"language={session.language}, "
+        f"meeting_title={session.meeting_title}, "
+        f"participants={session.participant_names}"
+    )
+
+    # 템플릿 기반 회의록 시트 생성
+    try:
+        # "YYYY-MM-DD HH:MM+09:00" 한 번만 만들어 날짜/시간으로 분리
+        start_iso = now.isoformat(sep=" ", timespec="minutes")
+        meeting_date, meeting_time_start = start_iso[:10], start_iso[11:16]
+
+        logger.debug("회의록 시트 생성: title=%s, date=%s", session.meeting_title, meeting_date)
+
+        sheet_info = await sheets_service.create_meeting_sheet(
+            meeting_title=session.meeting_title,
+            meeting_date=meeting_date,
+            meeting_time=meeting_time_start  # 시작 시간만 우선 기록
+        )
+
+        session.sheet_id = sheet_info["file_id"]
+        session.tab_id = sheet_info.get("tab_id")
+        session.tab_name = sheet_info.get("tab_name")
+        session.sheet_link = sheet_info["web_link"]
+        session.ready = True
+
+        # 녹취 버퍼 주기적 기록 시작
+        if session.flush_task is None:
+            session.flush_task = asyncio.create_task(_flush_periodically(session))
+
+        logger.info(f"SUCCESS: Sheet created - ID={session.sheet_id}, Link={session.sheet_link}")
+
+        # Speech API 스트리밍 세션 생성 및 시작
+        speaker_count = len(session.participant_names) if session.participant_names else None
+        session.speech_session = await speech_service.create_streaming_session(
+            language_code=session.language,
+            speaker_count=speaker_count
+        )
+
+        if session.audio_task is None:
+            session.audio_task = asyncio.create_task(_pump_audio(session))
+
+        # 결과 콜백 정의
+        async def on_speech_result(result: dict):
+            """Speech API 결과를 받아서 처리"""
+            text = result["text"]
+            speaker_id = result["speaker_id"]
+
+            logger.info(f"인식 결과: Speaker {speaker_id}: {text}")
+
+            # 화자 매핑 확인
+            speaker_mapping = session.speaker_mapping
+
+            if speaker_id not in speaker_mapping:
+                # 아직 매핑 안 됨 → 클라이언트에 요청
+                if isinstance(speaker_id, int) and speaker_id >= 0:
+                    session.unmapped_mask |= 1 << speaker_id
+
+                await _send_json(websocket, {
+                    "type": "speaker_mapping_required",
+                    "speaker_id": speaker_id,
+                    "stream": session.stream_index,
+                    "text": text,
+                    "available_names": session.available_names,
+                })
+
+                # 임시로 Speaker X로 저장
+                current_speaker = _temp_speaker_label(speaker_id, session.stream_index)
+            else:
+                # 이미 매핑됨
+                current_speaker = speaker_mapping[speaker_id]
+
+            # 화자 포맷 적용 (화자 변경 판단은 도착 순서대로 즉시 처리)
+            rows, speaker_changed = sheets_service.format_speaker_rows(
+                text=text,
+                current_speaker=current_speaker,
+                last_speaker=session.last_speaker_name
+            )
+
+            # 세션 업데이트
+            session.last_speaker_id = speaker_id
+            session.last_speaker_name = current_speaker
+            session.transcription_count += 1
+
+            # 버퍼에 모았다가 시트에 일괄 기록 (기록 후 클라이언트에 확인)
+            await _enqueue_rows(session, rows, {
+                "type": "transcription_recorded",
+                "text": text,
+                "speaker": current_speaker,
+                "speaker_changed": speaker_changed,
+            })
+
+        async def on_stream_rotated():
+            """
+            Speech 스트림 교체: 새 스트림은 화자 번호를 새로 매기므로 이전 매핑을 버리고
+            클라이언트에 다시 매핑을 요청 (이전 스트림의 임시 레이블은 시트에 그대로 남음)
+            """
+            session.stream_index += 1
+            session.speaker_mapping = {}
+            session.last_speaker_id = None
+            session.last_speaker_name = None
+            session.unmapped_mask = 0
+            session.available_names = list(session.participant_names)
+            logger.info("화자 매핑 초기화 (스트림 교체): session_id=%s, stream=%d", session_id, session.stream_index)
+
+            await _send_json(websocket, {
+                "type": "speakers_reset",
+                "stream": session.stream_index,
+                "message": "음성 인식 스트림이 교체되어 화자를 다시 지정해야 합니다",
+            })
+
+        # 콜백 저장 (첫 오디오 도착 시 스트림 시작)
+        session.speech_callback = on_speech_result
+        session.rotation_callback = on_stream_rotated
+        session.speech_started = False  # 스트림 시작 여부
+        logger.info("Speech API 스트리밍 세션 준비 완료 (첫 오디오 대기 중)")
+
+        response_data = {
+            "type": "status",
+            "message": "녹음이 시작되었습니다",
+            "session_id": session_id,
+            "sheet_id": session.sheet_id,
+            "sheet_link": session.sheet_link,
+        }
+        logger.info(f"Sending response: {response_data}")
+        await _send_json(websocket, response_data)
+
+    except Exception as e:
+        logger.exception("시트 생성 실패: session_id=%s", session_id)
+        await _send_json(websocket, {
+            "type": "error",
+            "message": f"시트 생성 실패: {str(e)}",
+        })
+
+
+async def _handle_audio(session: RecordingSession, audio_bytes: Union[bytes, dict]) -> None:
+    """오디오 청크 수신 (바이너리 프레임, 초당 수십 회이므로 DEBUG 레벨에서만 기록)"""
+    websocket = session.websocket
+    session_id = session.session_id
+
+    if not isinstance(audio_bytes, bytes):
+        # JSON {"type": "audio"} 텍스트 프레임은 더 이상 지원하지 않음
+        await _send_json(websocket, {
+            "type": "error",
+            "message": "오디오는 바이너리 프레임으로 전송해야 합니다",
+        })
+    elif session.speech_session:
+        # 큐에 넣기만 하고 Speech 전달은 _pump_audio가 담당
+        # 큐가 가득 차면 자리가 날 때까지 수신을 멈춰 클라이언트 쪽으로 역압 전달 (청크는 버리지 않음)
+        try:
+            await asyncio.wait_for(session.audio_queue.put(audio_bytes), _AUDIO_PUT_TIMEOUT_SEC)
+        except asyncio.TimeoutError:
+            logger.error("오디오 전달 정체로 세션 종료: session_id=%s", session_id)
+            await _send_json(websocket, {
+                "type": "error",
+                "message": "음성 인식 서버로 오디오를 전달하지 못해 녹음을 중단합니다",
+            })
+            await websocket.close(code=1011)
+            raise WebSocketDisconnect(1011)
+
+        try:
+            # 첫 오디오 도착 시 스트림 시작 (첫 오디오가 먼저 큐에 들어가 타임아웃 방지)
+            if not session.speech_started:
+                logger.info("첫 오디오 수신, Speech API 스트림 시작: session_id=%s", session_id)
+                session.speech_started = True
+
+                # 스트림 시작 (비동기 태스크로 실행)
+                speech_callback = session.speech_callback
+                if speech_callback:
+                    await session.speech_session.start_immediately(
+                        speech_callback, session.rotation_callback
+                    )
+                else:
+                    logger.error("speech_callback 없음: session_id=%s", session_id)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[AUDIO] %d bytes: session_id=%s", len(audio_bytes), session_id)
+
+        except Exception:
+            logger.exception("오디오 처리 실패: session_id=%s", session_id)
+    else:
+        logger.debug("Speech 세션 없음, 오디오 무시: session_id=%s", session_id)
+
+
+async def _handle_speaker_mapping(session: RecordingSession, data: dict) -> None:
+    """화자 매핑 (Speaker N → 참석자 이름)"""
+    websocket = session.websocket
+
+    speaker_id = data.get("speaker_id")
+    speaker_name = data.get("speaker_name")
+    # 매핑 요청을 보낸 스트림 순번 (없으면 현재 스트림)
+    stream_index = data.get("stream", session.stream_index)
+
+    if speaker_id is not None and speaker_name:
+        # 스트림 교체 전 요청에 대한 응답이면 이전 스트림의 임시 레이블만 바꾸고 현재 매핑은 유지
+        if stream_index == session.stream_index:
+            session.speaker_mapping[speaker_id] = speaker_name
+            if isinstance(speaker_id, int) and speaker_id >= 0:
+                session.unmapped_mask &= ~(1 << speaker_id)
+
+            # 매핑 가능한 이름 목록 갱신 (인식 결과마다가 아니라 매핑 시에만 계산)
+            mapped_names = set(session.speaker_mapping.values())
+            session.available_names = [
+                name for name in session.participant_names
+                if name not in mapped_names
+            ]
+
+        logger.info(f"화자 매핑: Speaker {speaker_id} (stream {stream_index}) = {speaker_name}")
+
+        # 레이블 업데이트 (연속된 매핑은 모아서 한 번에 반영)
+        session.pending_labels[_temp_speaker_label(speaker_id, stream_index)] = speaker_name
+        _schedule_label_updates(session)
+
+        await _send_json(websocket, {
+            "type": "speaker_mapped",
+            "speaker_id": speaker_id,
+            "speaker_name": speaker_name
+        })
+
+
+async def _handle_transcription(session: RecordingSession, data: dict) -> None:
+    """
+    클라이언트가 직접 변환한 텍스트를 전송하는 경우
+    (브라우저의 Web Speech API 등 사용 시)
+    """
+    session_id = session.session_id
+
+    text = data.get("text", "").strip()
+    if text and session.ready:
+        session.transcription_count += 1
+        logger.debug("텍스트 수신: session_id=%s, text=%s", session_id, text)
+
+        # 버퍼에 모았다가 시트에 일괄 기록 (C13부터)
+        await _enqueue_rows(session, [text], {
+            "type": "transcription_received",
+            "text": text,
+        })
+
+
+async def _handle_end(session: RecordingSession, data: dict) -> None:
+    """녹음 종료: 남은 버퍼 기록 후 완료 메시지 전송"""
+    websocket = session.websocket
+    session_id = session.session_id
+
+    logger.info("녹음 종료: session_id=%s", session_id)
+
+    # 버퍼에 남은 녹취 기록 및 대기 중인 레이블 반영
+    await _flush_pending_rows(session)
+    if session.label_timer is not None:
+        session.label_timer.cancel()
+        session.label_timer = None
+    await _apply_label_updates(session)
+
+    if not session.transcription_count:
+        await _send_json(websocket, {
+            "type": "error",
+            "message": "녹음된 내용이 없습니다",
+        })
+        return
+
+    # 이미 실시간으로 C13부터 기록되었으므로 완료 메시지만 전송
+    # (텍스트는 transcription_recorded로 이미 전달되어 클라이언트가 직접 보관)
+    await _send_json(websocket, {
+        "type": "completed",
+        "message": "회의 내용이 성공적으로 저장되었습니다",
+        "sheet_id": session.sheet_id,
+        "sheet_link": session.sheet_link,
+        "transcription_count": session.transcription_count,
+    })
+
+    logger.info("회의 종료 완료: session_id=%s, sheet=%s", session_id, session.sheet_id)
+
+    # 세션 정리
+    session.transcription_count = 0
+
+
+# 메시지 타입별 처리 함수
+_HANDLERS: Dict[str, Callable[[RecordingSession, Any], Awaitable[None]]] = {
+    "start": _handle_start,
+    "audio": _handle_audio,
+    "speaker_mapping": _handle_speaker_mapping,
+    "transcription": _handle_transcription,
+    "end": _handle_end,
+}
 
 
 @router.websocket("/test")
 async def websocket_test(websocket: WebSocket):
     """Simple test endpoint"""
     await websocket.accept()
-    await websocket.send_json({"message": "Test connection successful"})
+    await _send_json(websocket, {"message": "Test connection successful"})
     await websocket.close()
 
 
@@ -39,356 +538,112 @@ async def websocket_record(websocket: WebSocket):
     메시지 형식:
     - 클라이언트 -> 서버:
         {"type": "start", "language": "ko", "speaker": "홍길동", "meeting_title": "회의 제목"}
-        {"type": "audio", "data": "<base64 encoded audio>"}
+        <binary frame: 오디오 청크 (WEBM_OPUS, Base64 인코딩 없음)>
         {"type": "end"}
 
     - 서버 -> 클라이언트:
         {"type": "status", "message": "녹음 시작됨", "session_id": "..."}
         {"type": "transcription", "text": "변환된 텍스트"}
-        {"type": "completed", "message": "회의가 저장되었습니다", "sheet_row": 123}
+        {"type": "completed", "message": "회의가 저장되었습니다", "sheet_link": "...", "transcription_count": 42}
         {"type": "error", "message": "에러 메시지"}
     """
     await websocket.accept()
-    session_id = str(uuid.uuid4())
-    import sys
-    print(f"[VERSION 2.0] WebSocket 연결됨: session_id={session_id}", file=sys.stderr, flush=True)
 
-    # 세션 데이터 초기화
-    session = {
-        "session_id": session_id,
-        "language": "ko-KR",
-        "speaker": settings.default_speaker,
-        "meeting_title": None,
-        "transcription_parts": [],  # 실시간으로 받은 텍스트 조각들
-        "start_time": None,
-        "sheet_id": None,  # 템플릿 시트 ID (파일 ID)
-        "tab_id": None,  # 생성된 탭 ID
-        "tab_name": None,  # 생성된 탭 이름
-        "sheet_link": None,  # 탭 링크
-
-        # 화자 관련 추가
-        "participant_names": [],  # 참석자 명단 ["홍길동", "김철수"]
-        "speaker_mapping": {},  # {1: "홍길동", 2: "김철수"}
-        "last_speaker_id": None,  # 마지막 화자 Speaker ID
-        "last_speaker_name": None,  # 마지막 화자 이름
-        "unmapped_speakers": set(),  # 아직 매핑 안 된 Speaker ID들
+    # 세션 수 상한 초과 시 새 연결 거부 (메모리 무한 증가 방지)
+    if len(active_sessions) >= settings.ws_max_sessions:
+        logger.warning(f"세션 수 상한 초과로 연결 거부: {len(active_sessions)}개 활성")
+        await _send_json(websocket, {
+            "type": "error",
+            "message": "서버가 혼잡합니다. 잠시 후 다시 시도해주세요",
+        })
+        await websocket.close(code=1013)
+        return
 
-        # Speech API 스트리밍 세션 (지속적 연결)
-        "speech_session": None,  # SpeechStreamingSession 객체
-        "websocket": websocket,  # WebSocket 객체 (콜백에서 사용)
-    }
+    session_id = secrets.token_hex(8)
+    logger.info("WebSocket 연결됨: session_id=%s", session_id)
+
+    # 세션 데이터 초기화
+    session = RecordingSession(session_id, websocket)
     active_sessions[session_id] = session
 
     try:
         while True:
             # 클라이언트로부터 메시지 수신
-            message = await websocket.receive_text()
-            data = json.loads(message)
-            message_type = data.get("type")
-
-            if message_type == "start":
-                # 녹음 시작
-                session["language"] = data.get("language", "ko-KR")
-                session["speaker"] = data.get("speaker", settings.default_speaker)
-                session["meeting_title"] = data.get("meeting_title", "제목없음")
-                session["start_time"] = datetime.now()
-
-                # 참석자 명단 파싱
-                participants_str = data.get("participants", "")
-                if participants_str:
-                    session["participant_names"] = [
-                        name.strip()
-                        for name in participants_str.split(",")
-                        if name.strip()
-                    ]
-
-                logger.info(
-                    f"녹음 시작: session_id={session_id}, "
-                    f"speaker={session['speaker']}, "
-                    f"language={session['language']}, "
-                    f"meeting_title={session['meeting_title']}, "
-                    f"participants={session['participant_names']}"
-                )
-
-                # 템플릿 기반 회의록 시트 생성
-                try:
-                    meeting_date = session["start_time"].strftime("%Y-%m-%d")
-                    meeting_time_start = session["start_time"].strftime("%H:%M")
-
-                    import sys
-                    print(f"DEBUG: Creating meeting sheet - title={session['meeting_title']}, date={meeting_date}", file=sys.stderr, flush=True)
-
-                    sheet_info = await sheets_service.create_meeting_sheet(
-                        meeting_title=session["meeting_title"],
-                        meeting_date=meeting_date,
-                        meeting_time=meeting_time_start  # 시작 시간만 우선 기록
-                    )
-
-                    session["sheet_id"] = sheet_info["file_id"]
-                    session["tab_id"] = sheet_info.get("tab_id")
-                    session["tab_name"] = sheet_info.get("tab_name")
-                    session["sheet_link"] = sheet_info["web_link"]
-
-                    logger.info(f"SUCCESS: Sheet created - ID={session['sheet_id']}, Link={session['sheet_link']}")
-
-                    # Speech API 스트리밍 세션 생성 및 시작
-                    speaker_count = len(session["participant_names"]) if session["participant_names"] else None
-                    session["speech_session"] = await speech_service.create_streaming_session(
-                        language_code=session["language"],
-                        speaker_count=speaker_count
-                    )
-
-                    # 결과 콜백 정의
-                    async def on_speech_result(result: dict):
-                        """Speech API 결과를 받아서 처리"""
-                        text = result["text"]
-                        speaker_id = result["speaker_id"]
-
-                        logger.info(f"인식 결과: Speaker {speaker_id}: {text}")
-
-                        # 화자 매핑 확인
-                        speaker_mapping = session["speaker_mapping"]
-
-                        if speaker_id not in speaker_mapping:
-                            # 아직 매핑 안 됨 → 클라이언트에 요청
-                            session["unmapped_speakers"].add(speaker_id)
-
-                            await websocket.send_json({
-                                "type": "speaker_mapping_required",
-                                "speaker_id": speaker_id,
-                                "text": text,
-                                "available_names": [
-                                    name for name in session["participant_names"]
-                                    if name not in speaker_mapping.values()
-                                ]
-                            })
-
-                            # 임시로 Speaker X로 저장
-                            current_speaker = f"Speaker {speaker_id}"
-                        else:
-                            # 이미 매핑됨
-                            current_speaker = speaker_mapping[speaker_id]
-
-                        # 시트에 기록
-                        last_speaker = session.get("last_speaker_name")
-
-                        sheet_result = await sheets_service.append_transcription_with_speaker(
-                            sheet_id=session["sheet_id"],
-                            tab_name=session["tab_name"],
-                            text=text,
-                            current_speaker=current_speaker,
-                            last_speaker=last_speaker
-                        )
-
-                        # 세션 업데이트
-                        session["last_speaker_id"] = speaker_id
-                        session["last_speaker_name"] = current_speaker
-                        session["transcription_parts"].append(text)
-
-                        # 클라이언트에 확인
-                        await websocket.send_json({
-                            "type": "transcription_recorded",
-                            "text": text,
-                            "speaker": current_speaker,
-                            "speaker_changed": sheet_result["speaker_changed"],
-                            "row": sheet_result["row"]
-                        })
-
-                    # 콜백 저장 (첫 오디오 도착 시 스트림 시작)
-                    session["speech_callback"] = on_speech_result
-                    session["speech_started"] = False  # 스트림 시작 여부
-                    logger.info("Speech API 스트리밍 세션 준비 완료 (첫 오디오 대기 중)")
-
-                    response_data = {
-                        "type": "status",
-                        "message": "녹음이 시작되었습니다",
-                        "session_id": session_id,
-                        "sheet_id": session["sheet_id"],
-                        "sheet_link": session["sheet_link"],
-                    }
-                    logger.info(f"Sending response: {response_data}")
-                    await websocket.send_json(response_data)
-
-                except Exception as e:
-                    import traceback
-                    error_details = traceback.format_exc()
-                    logger.error(f"ERROR: Sheet creation failed")
-                    logger.error(f"ERROR: {str(e)}")
-                    logger.error(f"TRACEBACK: {error_details}")
-                    await websocket.send_json({
-                        "type": "error",
-                        "message": f"시트 생성 실패: {str(e)}",
-                    })
-
-            elif message_type == "audio":
-                # 오디오 청크 수신 (Base64 인코딩됨)
-                audio_base64 = data.get("data")
-                import sys
-                print(f"[AUDIO] Received audio message, base64 length: {len(audio_base64) if audio_base64 else 0}", file=sys.stderr, flush=True)
-
-                if audio_base64 and session.get("speech_session"):
-                    # Base64 디코딩
-                    try:
-                        audio_bytes = base64.b64decode(audio_base64)
-                        print(f"[AUDIO] Decoded audio chunk: {len(audio_bytes)} bytes", file=sys.stderr, flush=True)
-
-                        # 첫 오디오 도착 시 스트림 시작
-                        if not session.get("speech_started"):
-                            print("[START] First audio arrived! Starting Speech API stream...", file=sys.stderr, flush=True)
-                            session["speech_started"] = True
-
-                            # 중요: 첫 오디오를 먼저 큐에 추가 (타임아웃 방지)
-                            await session["speech_session"].send_audio(audio_bytes)
-                            print(f"[OK] First audio added to queue: {len(audio_bytes)} bytes", file=sys.stderr, flush=True)
-
-                            # 스트림 시작 (비동기 태스크로 실행)
-                            speech_callback = session.get("speech_callback")
-                            if speech_callback:
-                                await session["speech_session"].start_immediately(speech_callback)
-                            else:
-                                print("[ERROR] speech_callback not found!", file=sys.stderr, flush=True)
-                        else:
-                            # 이후 오디오는 계속 큐에 추가
-                            await session["speech_session"].send_audio(audio_bytes)
-
-                    except Exception as e:
-                        print(f"[ERROR] Audio processing failed: {e}", file=sys.stderr, flush=True)
-                        import traceback
-                        traceback.print_exc()
-                else:
-                    print(f"[WARNING] Audio processing skipped - base64={bool(audio_base64)}, session={bool(session.get('speech_session'))}", file=sys.stderr, flush=True)
-
-            elif message_type == "speaker_mapping":
-                # 화자 매핑
-                speaker_id = data.get("speaker_id")
-                speaker_name = data.get("speaker_name")
-
-                if speaker_id is not None and speaker_name:
-                    session["speaker_mapping"][speaker_id] = speaker_name
-                    session["unmapped_speakers"].discard(speaker_id)
-
-                    logger.info(f"화자 매핑: Speaker {speaker_id} = {speaker_name}")
-
-                    # 레이블 업데이트
-                    try:
-                        await sheets_service.update_speaker_labels(
-                            sheet_id=session["sheet_id"],
-                            tab_name=session["tab_name"],
-                            old_label=f"Speaker {speaker_id}",
-                            new_label=speaker_name
-                        )
-                    except Exception as e:
-                        logger.error(f"레이블 업데이트 실패: {e}")
-
-                    await websocket.send_json({
-                        "type": "speaker_mapped",
-                        "speaker_id": speaker_id,
-                        "speaker_name": speaker_name
-                    })
-
-            elif message_type == "transcription":
-                # 클라이언트가 직접 변환한 텍스트를 전송하는 경우
-                # (브라우저의 Web Speech API 등 사용 시)
-                text = data.get("text", "").strip()
-                if text and session.get("sheet_id") and session.get("tab_name"):
-                    session["transcription_parts"].append(text)
-                    print(f"텍스트 수신: session_id={session_id}, text={text}")
-
-                    # 실시간으로 시트에 기록 (C13부터)
-                    try:
-                        row_number = await sheets_service.append_transcription_to_sheet(
-                            sheet_id=session["sheet_id"],
-                            tab_name=session["tab_name"],
-                            transcription=text
-                        )
-
-                        # 클라이언트에 확인 전송
-                        await websocket.send_json({
-                            "type": "transcription_received",
-                            "text": text,
-                            "row": row_number,
-                        })
-
-                    except Exception as e:
-                        print(f"실시간 녹취 기록 실패: {str(e)}")
-                        await websocket.send_json({
-                            "type": "error",
-                            "message": f"녹취 기록 실패: {str(e)}",
-                        })
-
-            elif message_type == "end":
-                # 녹음 종료
-                print(f"녹음 종료: session_id={session_id}")
-
-                # 전체 텍스트 병합
-                full_transcription = " ".join(session["transcription_parts"])
-
-                if not full_transcription.strip():
-                    await websocket.send_json({
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if message.get("bytes") is not None:
+                # 바이너리 프레임은 오디오 청크 (Base64/JSON 인코딩 없음)
+                handler = _handle_audio
+                payload = message["bytes"]
+            else:
+                # 텍스트 프레임은 JSON 제어 메시지 (오디오는 바이너리 프레임으로만 수신)
+                payload = orjson.loads(message["text"])
+                message_type = payload.get("type")
+                handler = _HANDLERS.get(message_type)
+                if handler is None:
+                    await _send_json(websocket, {
                         "type": "error",
-                        "message": "녹음된 내용이 없습니다",
+                        "message": f"알 수 없는 메시지 타입: {message_type}",
                     })
                     continue
 
-                # 이미 실시간으로 C13부터 기록되었으므로 완료 메시지만 전송
-                await websocket.send_json({
-                    "type": "completed",
-                    "message": "회의 내용이 성공적으로 저장되었습니다",
-                    "sheet_id": session.get("sheet_id"),
-                    "sheet_link": session.get("sheet_link"),
-                    "transcription": full_transcription,
-                    "transcription_count": len(session["transcription_parts"]),
-                })
-
-                print(f"회의 종료 완료: session_id={session_id}, sheet={session.get('sheet_id')}")
-
-                # 세션 정리
-                session["transcription_parts"].clear()
-
-            else:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": f"알 수 없는 메시지 타입: {message_type}",
-                })
+            await handler(session, payload)
 
     except WebSocketDisconnect:
-        print(f"WebSocket 연결 종료: session_id={session_id}")
+        logger.info("WebSocket 연결 종료: session_id=%s", session_id)
     except Exception as e:
-        print(f"WebSocket 에러: {str(e)}")
+        logger.error("WebSocket 에러: %s", e)
         try:
-            await websocket.send_json({
+            await _send_json(websocket, {
                 "type": "error",
                 "message": f"서버 에러: {str(e)}",
             })
         except:
             pass
     finally:
-        # Speech API 스트리밍 세션 종료
-        if session_id in active_sessions:
-            session = active_sessions[session_id]
-            if session.get("speech_session"):
-                try:
-                    await session["speech_session"].stop()
-                    logger.info(f"Speech API 스트림 종료: session_id={session_id}")
-                except Exception as e:
-                    logger.error(f"Speech API 스트림 종료 실패: {e}")
+        # 오디오 전달 중단
+        if session.audio_task is not None:
+            session.audio_task.cancel()
+
+        # Speech API 스트리밍 세션 종료 (스트림을 비우는 동안 도착한 최종 결과까지 버퍼에 쌓임)
+        if active_sessions.pop(session_id, None) is not None and session.speech_session:
+            try:
+                await session.speech_session.stop()
+                logger.info(f"Speech API 스트림 종료: session_id={session_id}")
+            except Exception as e:
+                logger.error(f"Speech API 스트림 종료 실패: {e}")
+
+        # 남은 녹취 버퍼 기록
+        if session.flush_task is not None:
+            session.flush_task.cancel()
+        try:
+            await _flush_pending_rows(session)
+        except Exception as e:
+            logger.error(f"남은 녹취 기록 실패: {e}")
+
+        # 대기 중인 화자 레이블 반영
+        if session.label_timer is not None:
+            session.label_timer.cancel()
+        await _apply_label_updates(session)
 
-            del active_sessions[session_id]
-        print(f"세션 정리 완료: session_id={session_id}")
+        logger.info("세션 정리 완료: session_id=%s", session_id)
 
 
 @router.get("/sessions")
 async def get_active_sessions():
     """활성 세션 목록 조회 (디버깅용)"""
-    return {
+    # orjson이 datetime을 직접 직렬화하도록 응답 객체를 바로 반환 (jsonable_encoder 생략)
+    return ORJSONResponse({
         "active_sessions": len(active_sessions),
         "sessions": [
             {
-                "session_id": session["session_id"],
-                "speaker": session["speaker"],
-                "start_time": session["start_time"].isoformat() if session["start_time"] else None,
-                "transcription_count": len(session["transcription_parts"]),
+                "session_id": session.session_id,
+                "speaker": session.speaker,
+                "start_time": session.start_time,
+                "transcription_count": session.transcription_count,
             }
             for session in active_sessions.values()
         ],
-    }
+    })
@@ -1,10 +1,11 @@
+import logging
 from datetime import datetime
 from typing import Optional
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-
 from app.config.settings import settings
+from app.services import google_api
+
+logger = logging.getLogger(__name__)
 
 
 class GoogleDriveService:
@@ -16,18 +17,12 @@ class GoogleDriveService:
             "https://www.googleapis.com/auth/drive",  # 모든 Drive 파일 접근 (템플릿 복사용)
             "https://www.googleapis.com/auth/spreadsheets",  # Sheets 접근
         ]
-        self.service = None
 
     def _get_service(self):
-        """서비스 클라이언트를 lazy initialization으로 생성"""
-        if self.service is None:
-            # 서비스 계정 인증
-            credentials = service_account.Credentials.from_service_account_file(
-                settings.google_application_credentials, scopes=self.scopes
-            )
-            # Drive API 클라이언트 생성
-            self.service = build("drive", "v3", credentials=credentials)
-        return self.service
+        """공유 Drive API 클라이언트 반환 (인증/클라이언트 생성은 프로세스당 한 번)"""
+        return google_api.get_service(
+            "drive", "v3", settings.google_application_credentials, tuple(self.scopes)
+        )
 
     async def copy_template_sheet(
         self,
@@ -70,24 +65,20 @@ class GoogleDriveService:
                 copy_body["parents"] = [target_folder]
 
             # 템플릿 시트 복사
-            print(f"INFO: Copying template sheet: {settings.google_template_sheet_id}")
-            print(f"INFO: New file name: {new_file_name}")
-
-            copied_file = (
-                service.files()
-                .copy(fileId=settings.google_template_sheet_id, body=copy_body)
-                .execute()
-            )
+            logger.debug("템플릿 시트 복사: %s -> %s", settings.google_template_sheet_id, new_file_name)
 
-            # 파일 정보 조회 (webViewLink 포함)
-            file_info = (
+            # 복사 응답에서 바로 webViewLink까지 받음 (별도 files().get 호출 불필요)
+            file_info = await google_api.execute(
                 service.files()
-                .get(fileId=copied_file["id"], fields="id,name,webViewLink,createdTime")
-                .execute()
+                .copy(
+                    fileId=settings.google_template_sheet_id,
+                    body=copy_body,
+                    fields="id,name,webViewLink,createdTime,parents",
+                ),
+                idempotent=False,  # 재시도하면 사본이 두 개 생길 수 있음
             )
 
-            print(f"INFO: New file created: {file_info['id']}")
-            print(f"INFO: Web link: {file_info.get('webViewLink', 'N/A')}")
+            logger.info("새 파일 생성: %s (%s)", file_info["id"], file_info.get("webViewLink", "N/A"))
 
             return file_info
 
@@ -109,10 +100,9 @@ class GoogleDriveService:
         """
         try:
             service = self._get_service()
-            file_info = (
+            file_info = await google_api.execute(
                 service.files()
                 .get(fileId=file_id, fields="id,name,webViewLink,createdTime,modifiedTime")
-                .execute()
             )
             return file_info
 
@@ -134,8 +124,8 @@ class GoogleDriveService:
         """
         try:
             service = self._get_service()
-            service.files().delete(fileId=file_id).execute()
-            print(f"INFO: File deleted: {file_id}")
+            await google_api.execute(service.files().delete(fileId=file_id))
+            logger.info("파일 삭제: %s", file_id)
             return True
 
         except Exception as e:
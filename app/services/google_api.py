@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from googleapiclient.errors import HttpError
+
+# discovery/인증/httplib2 모듈은 무거우므로 실제로 클라이언트가 필요할 때 import
+# (sheets_service 등을 import만 하는 경우 앱 시작 비용이 들지 않음)
+
+logger = logging.getLogger(__name__)
+
+# Google API(.execute()) 전용 스레드 풀
+# 기본 풀(asyncio.to_thread)은 librosa 변환 등과 공유되므로 분리하고,
+# 여러 세션이 동시에 시작해도 대기열이 밀리지 않도록 여유 있게 설정
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="google-api")
+
+# Cloud 클라이언트 라이브러리(Speech 등) 인증 스코프
+CLOUD_PLATFORM_SCOPES = ("https://www.googleapis.com/auth/cloud-platform",)
+
+# Cloud gRPC 클라이언트(Speech) 채널 옵션
+# 유휴 연결이 중간 장비에서 끊기지 않도록 30초마다 keepalive ping, 메시지 크기 제한 해제 (라이브러리 기본값과 동일)
+GRPC_CHANNEL_OPTIONS = (
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+)
+
+# 재시도 대상 HTTP 상태 (할당량 초과 / 일시적 서버 오류)
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# 멱등이 아닌 요청(행 추가, 탭/파일 생성 등)도 재시도하는 상태
+# 429는 요청을 처리하기 전에 거절한 것이지만, 5xx는 서버가 이미 반영한 뒤일 수 있어 중복될 수 있음
+_NON_IDEMPOTENT_RETRYABLE_STATUSES = frozenset({429})
+
+# Retry-After 헤더를 따를 때의 최대 대기 시간 (초)
+_MAX_RETRY_AFTER_SEC = 60.0
+
+
+@lru_cache(maxsize=None)
+def get_credentials(credentials_path: str, scopes: Tuple[str, ...]):
+    """서비스 계정 인증 정보 반환 (키 파일은 경로/스코프 조합별로 한 번만 읽음)"""
+    from google.oauth2 import service_account
+
+    return service_account.Credentials.from_service_account_file(
+        credentials_path, scopes=list(scopes)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_service(api_name: str, api_version: str, credentials_path: str, scopes: Tuple[str, ...]):
+    """
+    프로세스 전체에서 공유하는 googleapiclient 서비스 객체 반환
+
+    라이브러리에 포함된 discovery 문서를 사용하여(static_discovery)
+    클라이언트 생성 시 discovery HTTP 요청이 발생하지 않습니다.
+    """
+    from googleapiclient.discovery import build
+
+    return build(
+        api_name,
+        api_version,
+        credentials=get_credentials(credentials_path, scopes),
+        cache_discovery=False,
+        static_discovery=True,
+    )
+
+
+class TokenBucket:
+    """
+    API 호출 속도 제한 (토큰 버킷)
+
+    할당량 초과(429) 응답을 받으면 충전 속도를 절반으로 줄이고,
+    정상 응답이 이어지면 설정값까지 조금씩 회복합니다.
+    """
+
+    def __init__(self, capacity: int, refill_per_sec: float):
+        self.capacity = capacity
+        self.max_refill_per_sec = refill_per_sec
+        self.min_refill_per_sec = refill_per_sec / 8
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None  # 이벤트 루프에서 처음 사용할 때 생성
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """토큰 하나를 사용 (없으면 충전될 때까지 대기, 대기 순서대로 처리)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.refill_per_sec)
+
+    def on_throttled(self) -> None:
+        """429 응답 시 충전 속도 감소"""
+        self._refill()
+        self.refill_per_sec = max(self.min_refill_per_sec, self.refill_per_sec / 2)
+
+    def on_success(self) -> None:
+        """정상 응답 시 충전 속도를 설정값 쪽으로 회복"""
+        if self.refill_per_sec < self.max_refill_per_sec:
+            self._refill()
+            self.refill_per_sec = min(
+                self.max_refill_per_sec, self.refill_per_sec + self.max_refill_per_sec / 20
+            )
+
+
+# 스레드별 HTTP 객체 (httplib2.Http는 스레드 안전하지 않음)
+# 풀의 각 스레드가 keep-alive 연결을 유지하므로 요청마다 TCP/TLS 연결을 새로 맺지 않음
+_local = threading.local()
+
+
+def _thread_base_http():
+    """현재 스레드의 연결 풀 (Drive/Sheets/토큰 갱신 요청이 호스트별 연결을 공유)"""
+    http = getattr(_local, "base_http", None)
+    if http is None:
+        from googleapiclient.http import build_http
+
+        # googleapiclient 기본값과 같은 타임아웃/리다이렉트 설정
+        http = _local.base_http = build_http()
+    return http
+
+
+def _thread_http(credentials):
+    """현재 스레드 전용 AuthorizedHttp 반환 (인증 정보별로 한 번만 생성)"""
+    import google_auth_httplib2
+
+    cache = getattr(_local, "http", None)
+    if cache is None:
+        cache = _local.http = {}
+
+    entry = cache.get(id(credentials))
+    if entry is None or entry[0] is not credentials:
+        entry = (credentials, google_auth_httplib2.AuthorizedHttp(credentials, http=_thread_base_http()))
+        cache[id(credentials)] = entry
+    return entry[1]
+
+
+def _execute(request):
+    """요청 객체의 인증 정보로 스레드 전용 HTTP를 사용해 실행"""
+    credentials = getattr(request.http, "credentials", None)
+    if credentials is None:
+        return request.execute()
+    return request.execute(http=_thread_http(credentials))
+
+
+def _retry_after(resp) -> float:
+    """Retry-After 헤더(초 단위)를 읽어 대기 시간 반환 (없거나 날짜 형식이면 0)"""
+    try:
+        return min(float(resp.get("retry-after", 0)), _MAX_RETRY_AFTER_SEC)
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
+async def execute(
+    request,
+    *,
+    max_retries: int = 5,
+    base_delay: float = 0.2,
+    rate_limiter: Optional[TokenBucket] = None,
+    idempotent: bool = True,
+):
+    """
+    googleapiclient 요청을 전용 스레드 풀에서 실행 (이벤트 루프 블로킹 방지)
+
+    429/5xx 응답은 지수 백오프(full jitter)로 최대 max_retries번 재시도합니다.
+    idempotent=False인 요청은 429만 재시도합니다 (5xx 후 재시도하면 이미 반영된 변경이 중복될 수 있음).
+    응답에 Retry-After 헤더가 있으면 그 시간(최대 _MAX_RETRY_AFTER_SEC초) 이상 기다립니다.
+    대기는 이벤트 루프에서 하므로 재시도 중에도 풀 스레드를 점유하지 않습니다.
+
+    Args:
+        request: service.files().get(...) 등 .execute() 호출 전의 요청 객체
+        max_retries: 최대 재시도 횟수
+        base_delay: 첫 재시도의 최대 대기 시간 (초, 시도마다 두 배)
+        rate_limiter: 지정 시 매 시도 전에 토큰을 받아 호출 속도 제한
+        idempotent: 같은 요청을 두 번 실행해도 결과가 같은지 여부 (values.append, 생성 요청은 False)
+
+    Returns:
+        API 응답
+    """
+    loop = asyncio.get_running_loop()
+    retryable = _RETRYABLE_STATUSES if idempotent else _NON_IDEMPOTENT_RETRYABLE_STATUSES
+    attempt = 0
+    while True:
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        try:
+            response = await loop.run_in_executor(_executor, _execute, request)
+        except HttpError as e:
+            status = getattr(e.resp, "status", None)
+            if status == 429 and rate_limiter is not None:
+                rate_limiter.on_throttled()
+            if status not in retryable or attempt >= max_retries:
+                raise
+            delay = max(random.uniform(0, base_delay * (2 ** attempt)), _retry_after(e.resp))
+            attempt += 1
+            logger.warning(f"Google API 응답 {status}, {delay:.2f}초 후 재시도 ({attempt}/{max_retries})")
+            await asyncio.sleep(delay)
+            continue
+
+        if rate_limiter is not None:
+            rate_limiter.on_success()
+        return response
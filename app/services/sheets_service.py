@@ -1,15 +1,60 @@
+import asyncio
+import re
+import secrets
+import time
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 import logging
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 from app.config.settings import settings
 from app.models.transcribe import SheetRecord
+from app.services import google_api
 
 logger = logging.getLogger(__name__)
 
+# append_row 일괄 기록 시 한 번의 API 호출에 담는 최대 레코드 수
+_APPEND_BATCH_MAX_ROWS = 50
+
+# values.append 응답의 updatedRange에서 첫 행 번호 추출 (예: "Sheet1!A5:D7" -> 5)
+# 끝에 고정하여 시트 이름에 "!"가 포함되어도 마지막 범위만 매칭
+_RANGE_RE = re.compile(r"![A-Z]+(\d+)(?::[A-Z]+\d+)?$")
+
+# 회의록 탭에서 녹취 내용이 시작되는 행 (C열)
+_TRANSCRIPT_START_ROW = 13
+
+# duplicateSheet에 직접 지정하는 새 탭 ID 상한 (sheetId는 양의 int32)
+_MAX_SHEET_ID = 2**31 - 2
+
+# 템플릿 탭 캐시를 버리는 batchUpdate 오류 상태 (sourceSheetId가 없으면 400)
+_TEMPLATE_STALE_STATUSES = frozenset({400, 404})
+
+# 기본 시트 조회 결과 캐시 유지 시간 (초)
+_READ_CACHE_TTL_SEC = 30.0
+
+
+@lru_cache(maxsize=256)
+def _a1_prefix(tab_name: str) -> str:
+    """A1 범위 앞에 붙일 탭 이름 (작은따옴표로 감싸고 내부 작은따옴표는 '' 로 이스케이프)"""
+    return "'" + tab_name.replace("'", "''") + "'!"
+
+
+# 화자 레이블 치환 중간 단계에서 쓰는 임시 토큰 접두어
+_LABEL_TOKEN_PREFIX = "__speaker-label-"
+
+
+def _quote_replacement(text: str) -> str:
+    """findReplace(정규식) 치환 문자열에서 \\ 와 $를 문자 그대로 쓰도록 이스케이프 (Java 정규식 규칙)"""
+    return text.replace("\\", "\\\\").replace("$", "\\$")
+
+
+@lru_cache(maxsize=256)
+def _speaker_prefix(speaker: str) -> str:
+    """화자 변경 시 텍스트 앞에 붙는 "[화자명] " (회의 중 같은 화자가 반복되므로 재사용)"""
+    return f"[{speaker}] "
+
 
 class GoogleSheetsService:
     """Google Sheets API 연동 서비스"""
@@ -17,46 +62,116 @@ class GoogleSheetsService:
     def __init__(self):
         # Google Sheets API 스코프
         self.scopes = ["https://www.googleapis.com/auth/spreadsheets"]
-        self.service = None
         self.sheet_id = settings.google_sheet_id
 
+        # append_row 일괄 기록 (이벤트 루프에서 처음 호출될 때 생성)
+        self._append_queue: Optional[asyncio.Queue] = None
+        self._append_task: Optional[asyncio.Task] = None
+
+        # 템플릿 탭 정보 캐시 (템플릿 파일 ID, 탭 ID, 탭 이름)
+        self._template_tab: Optional[Tuple[str, int, str]] = None
+
+        # 탭별 C열 다음 빈 행 {(sheet_id, tab_name): 행 번호}
+        self._tab_next_row: Dict[Tuple[str, str], int] = {}
+
+        # 조회 결과 캐시 {(sheet_id, range): (만료 시각, 응답)}
+        self._read_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._read_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._cache_generation = 0  # 쓰기 발생 시 증가 (조회 중 쓰기가 끼면 결과를 캐시하지 않음)
+
+        # 헤더 존재를 확인한 시트 ID (프로세스 내에서는 다시 조회하지 않음)
+        self._initialized: Set[str] = set()
+
+        # 모든 Sheets API 호출이 공유하는 속도 제한
+        self._rate_limiter = google_api.TokenBucket(
+            settings.sheets_rate_capacity, settings.sheets_rate_per_sec
+        )
+
     def _get_service(self):
-        """서비스 클라이언트를 lazy initialization으로 생성"""
-        if self.service is None:
-            # 서비스 계정 인증
-            credentials = service_account.Credentials.from_service_account_file(
-                settings.google_application_credentials, scopes=self.scopes
+        """공유 Sheets API 클라이언트 반환 (인증/클라이언트 생성은 프로세스당 한 번)"""
+        return google_api.get_service(
+            "sheets", "v4", settings.google_application_credentials, tuple(self.scopes)
+        )
+
+    async def _execute(self, request, idempotent: bool = True):
+        """속도 제한과 재시도를 적용해 Sheets API 요청 실행 (idempotent=False면 5xx는 재시도하지 않음)"""
+        return await google_api.execute(request, rate_limiter=self._rate_limiter, idempotent=idempotent)
+
+    async def prewarm(self) -> None:
+        """앱 시작 시 인증 및 클라이언트 생성을 미리 수행 (첫 요청의 콜드 스타트 제거)"""
+        try:
+            await asyncio.to_thread(self._get_service)
+            logger.info("Sheets API 클라이언트 준비 완료")
+        except Exception as e:
+            logger.warning(f"Sheets API 클라이언트 사전 준비 실패 (첫 요청 시 재시도): {e}")
+
+    async def _get_values(self, range_name: str, use_cache: bool = True) -> dict:
+        """
+        기본 시트의 values.get 호출 (TTL 캐시 적용)
+
+        같은 범위를 동시에 조회하면 한 번만 호출하고 결과를 공유합니다.
+
+        Args:
+            range_name: 조회 범위 (예: "A1:D1")
+            use_cache: False면 캐시를 거치지 않고 항상 API 호출
+        """
+        service = self._get_service()
+        if not use_cache:
+            return await self._execute(
+                service.spreadsheets()
+                .values()
+                .get(spreadsheetId=self.sheet_id, range=range_name)
+            )
+
+        key = (self.sheet_id, range_name)
+        lock = self._read_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._read_cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+            generation = self._cache_generation
+            result = await self._execute(
+                service.spreadsheets()
+                .values()
+                .get(spreadsheetId=self.sheet_id, range=range_name)
             )
-            # Sheets API 클라이언트 생성
-            self.service = build("sheets", "v4", credentials=credentials)
-        return self.service
+            if generation == self._cache_generation:
+                self._read_cache[key] = (time.monotonic() + _READ_CACHE_TTL_SEC, result)
+            return result
+
+    def _invalidate_read_cache(self) -> None:
+        """기본 시트에 쓰기가 발생하면 조회 캐시 비우기"""
+        self._cache_generation += 1
+        self._read_cache.clear()
 
     async def initialize_sheet(self) -> None:
         """
         시트 초기화 (헤더 행 생성)
-        이미 헤더가 있으면 스킵
+        이미 헤더가 있으면 스킵 (한 번 확인한 시트는 API 호출 없이 바로 반환)
         """
+        if self.sheet_id in self._initialized:
+            return
+
         try:
-            service = self._get_service()
             # 첫 번째 행 읽기
-            result = (
-                service.spreadsheets()
-                .values()
-                .get(spreadsheetId=self.sheet_id, range="A1:D1")
-                .execute()
-            )
+            result = await self._get_values("A1:D1")
 
             values = result.get("values", [])
 
             # 헤더가 없으면 생성
             if not values:
+                service = self._get_service()
                 headers = [["시각", "화자", "녹취 내용", "회의 제목"]]
-                service.spreadsheets().values().update(
+                await self._execute(service.spreadsheets().values().update(
                     spreadsheetId=self.sheet_id,
                     range="A1:D1",
                     valueInputOption="RAW",
                     body={"values": headers},
-                ).execute()
+                ))
+                self._invalidate_read_cache()
+
+            self._initialized.add(self.sheet_id)
 
         except Exception as e:
             raise Exception(f"시트 초기화 실패: {str(e)}")
@@ -74,46 +189,111 @@ class GoogleSheetsService:
         Raises:
             Exception: API 호출 실패 시
         """
-        try:
-            service = self._get_service()
-            # 레코드를 리스트로 변환
-            row_data = [
-                [
-                    record.timestamp,
-                    record.speaker,
-                    record.transcription,
-                    record.meeting_title or "",
-                ]
-            ]
+        return await self.append_row(
+            record.timestamp,
+            record.speaker,
+            record.transcription,
+            record.meeting_title,
+        )
+
+    async def append_row(
+        self,
+        timestamp: str,
+        speaker: str,
+        transcription: str,
+        meeting_title: Optional[str] = None,
+    ) -> int:
+        """
+        녹취 레코드를 시트에 추가 (SheetRecord 모델 생성/검증 없이 값을 바로 전달)
 
-            # 시트에 추가
-            result = (
-                service.spreadsheets()
-                .values()
-                .append(
-                    spreadsheetId=self.sheet_id,
-                    range="A:D",
-                    valueInputOption="RAW",
-                    insertDataOption="INSERT_ROWS",
-                    body={"values": row_data},
-                )
-                .execute()
-            )
+        Args:
+            timestamp: 녹취 시각 (YYYY-MM-DD HH:MM:SS)
+            speaker: 화자 이름
+            transcription: 변환된 텍스트
+            meeting_title: 회의 제목
 
-            # 추가된 행 번호 추출
-            updated_range = result.get("updates", {}).get("updatedRange", "")
-            # 예: 'Sheet1!A2:D2' -> 2
-            row_number = int(updated_range.split("!")[1].split(":")[0][1:])
+        Returns:
+            추가된 행 번호
 
-            return row_number
+        Raises:
+            Exception: API 호출 실패 시
+        """
+        try:
+            # 동시에 들어온 레코드들과 함께 한 번의 append 호출로 기록
+            self._ensure_append_worker()
+            future = asyncio.get_running_loop().create_future()
+            await self._append_queue.put(
+                ([timestamp, speaker, transcription, meeting_title or ""], future)
+            )
+            return await future
 
         except Exception as e:
             raise Exception(f"시트 레코드 추가 실패: {str(e)}")
 
-    async def get_all_records(self) -> List[List[str]]:
+    def _ensure_append_worker(self) -> None:
+        """레코드 일괄 기록 태스크를 처음 사용할 때 시작"""
+        if self._append_task is None or self._append_task.done():
+            self._append_queue = asyncio.Queue()
+            self._append_task = asyncio.create_task(self._run_append_batches())
+
+    async def _run_append_batches(self) -> None:
+        """
+        대기 중인 레코드를 모아 values.append 한 번으로 기록하고 각 요청에 행 번호 전달
+
+        별도 대기 시간 없이, 이전 호출이 진행되는 동안 쌓인 레코드를 다음 호출에 묶습니다.
+        """
+        append_queue = self._append_queue
+        while True:
+            batch = [await append_queue.get()]
+            while len(batch) < _APPEND_BATCH_MAX_ROWS and not append_queue.empty():
+                batch.append(append_queue.get_nowait())
+
+            try:
+                first_row = await self._append_rows([row for row, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for offset, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result(first_row + offset)
+
+    async def _append_rows(self, row_data: List[List[str]]) -> int:
+        """
+        여러 레코드를 한 번의 values.append 호출로 추가
+
+        Returns:
+            첫 번째 레코드가 추가된 행 번호
+        """
+        service = self._get_service()
+        result = await self._execute(
+            service.spreadsheets()
+            .values()
+            .append(
+                spreadsheetId=self.sheet_id,
+                range="A:D",
+                valueInputOption="RAW",
+                insertDataOption="INSERT_ROWS",
+                body={"values": row_data},
+            ),
+            idempotent=False,  # 재시도하면 같은 행이 두 번 추가될 수 있음
+        )
+        self._invalidate_read_cache()
+
+        # 추가된 행 번호 추출
+        updated_range = result.get("updates", {}).get("updatedRange", "")
+        # 예: 'Sheet1!A2:D4' -> 2
+        return int(_RANGE_RE.search(updated_range).group(1))
+
+    async def get_all_records(self, use_cache: bool = True) -> List[List[str]]:
         """
         시트의 모든 레코드 조회 (헤더 제외)
 
+        Args:
+            use_cache: False면 캐시를 거치지 않고 최신 데이터 조회
+
         Returns:
             레코드 리스트
 
@@ -121,13 +301,7 @@ class GoogleSheetsService:
             Exception: API 호출 실패 시
         """
         try:
-            service = self._get_service()
-            result = (
-                service.spreadsheets()
-                .values()
-                .get(spreadsheetId=self.sheet_id, range="A2:D")
-                .execute()
-            )
+            result = await self._get_values("A2:D", use_cache=use_cache)
 
             values = result.get("values", [])
             return values
@@ -135,10 +309,13 @@ class GoogleSheetsService:
         except Exception as e:
             raise Exception(f"시트 레코드 조회 실패: {str(e)}")
 
-    async def get_headers(self) -> List[str]:
+    async def get_headers(self, use_cache: bool = True) -> List[str]:
         """
         시트의 헤더 행 조회 (디버깅용)
 
+        Args:
+            use_cache: False면 캐시를 거치지 않고 최신 데이터 조회
+
         Returns:
             헤더 리스트
 
@@ -146,13 +323,7 @@ class GoogleSheetsService:
             Exception: API 호출 실패 시
         """
         try:
-            service = self._get_service()
-            result = (
-                service.spreadsheets()
-                .values()
-                .get(spreadsheetId=self.sheet_id, range="A1:Z1")
-                .execute()
-            )
+            result = await self._get_values("A1:Z1", use_cache=use_cache)
 
             values = result.get("values", [[]])[0]
             return values
@@ -171,19 +342,23 @@ class GoogleSheetsService:
             service = self._get_service()
 
             # 시트 전체 클리어
-            service.spreadsheets().values().clear(
+            await self._execute(service.spreadsheets().values().clear(
                 spreadsheetId=self.sheet_id,
                 range="A:Z"
-            ).execute()
+            ))
+            self._initialized.discard(self.sheet_id)
+            self._invalidate_read_cache()
 
             # 헤더 생성
             headers = [["시각", "화자", "녹취 내용", "회의 제목"]]
-            service.spreadsheets().values().update(
+            await self._execute(service.spreadsheets().values().update(
                 spreadsheetId=self.sheet_id,
                 range="A1:D1",
                 valueInputOption="RAW",
                 body={"values": headers},
-            ).execute()
+            ))
+            self._invalidate_read_cache()
+            self._initialized.add(self.sheet_id)
 
         except Exception as e:
             raise Exception(f"시트 클리어 및 초기화 실패: {str(e)}")
@@ -211,351 +386,397 @@ class GoogleSheetsService:
             Exception: API 호출 실패 시
         """
         try:
-            import sys
             service = self._get_service()
             # 템플릿 시트에서 탭 복사
             template_sheet_id = settings.google_template_sheet_id
-            print(f"[SHEET] Using template sheet ID: {template_sheet_id}", file=sys.stderr, flush=True)
-
-            # 1. 시트의 모든 탭 정보 가져오기
-            print(f"[SHEET] Fetching sheet metadata...", file=sys.stderr, flush=True)
-            sheet_metadata = service.spreadsheets().get(
-                spreadsheetId=template_sheet_id
-            ).execute()
-            print(f"[SHEET] Sheet metadata fetched successfully", file=sys.stderr, flush=True)
-
-            sheets = sheet_metadata.get('sheets', [])
-            if not sheets:
-                raise Exception("템플릿 시트에 워크시트가 없습니다")
-
-            # "템플릿" 또는 "Template" 이름을 가진 탭 찾기
-            # 없으면 첫 번째 탭을 템플릿으로 사용
-            template_tab_id = None
-            template_tab_name = None
-
-            for sheet in sheets:
-                sheet_title = sheet['properties']['title']
-                if sheet_title in ['템플릿', 'Template', 'TEMPLATE', 'template']:
-                    template_tab_id = sheet['properties']['sheetId']
-                    template_tab_name = sheet_title
-                    print(f"[OK] Template tab found: {template_tab_name} (ID: {template_tab_id})")
-                    break
-
-            # 템플릿 탭을 못 찾으면 첫 번째 탭 사용
-            if template_tab_id is None:
-                template_tab_id = sheets[0]['properties']['sheetId']
-                template_tab_name = sheets[0]['properties']['title']
-                print(f"[WARNING] Template tab not found, using first tab: {template_tab_name} (ID: {template_tab_id})")
-
-            print(f"[SHEET] Template tab ID: {template_tab_id}, Name: {template_tab_name}", file=sys.stderr, flush=True)
-
-            # 2. 새 탭 이름 생성 (중복 방지를 위해 타임스탬프 추가)
-            print(f"[SHEET] Creating new tab name...", file=sys.stderr, flush=True)
-            if not meeting_date:
-                meeting_date = datetime.now().strftime("%Y-%m-%d")
-
-            # 마이크로초까지 포함한 타임스탬프로 중복 방지
-            timestamp = datetime.now().strftime("%H%M%S-%f")[:15]  # HHMMSS-mmmmmm 형식
-            new_tab_name = f"{meeting_date} {meeting_title} ({timestamp})"
-
-            # 3. 템플릿 탭 복사
-            print(f"[SHEET] Copying template tab '{template_tab_name}' to '{new_tab_name}'...", file=sys.stderr, flush=True)
-            copy_request = {
-                "duplicateSheet": {
-                    "sourceSheetId": template_tab_id,
-                    "newSheetName": new_tab_name
-                }
-            }
+            logger.debug("템플릿 시트 ID: %s", template_sheet_id)
 
-            response = service.spreadsheets().batchUpdate(
-                spreadsheetId=template_sheet_id,
-                body={"requests": [copy_request]}
-            ).execute()
-
-            # 복사된 탭 ID 가져오기
-            new_tab_id = response['replies'][0]['duplicateSheet']['properties']['sheetId']
-
-            print(f"[SUCCESS] Tab copied - ID: {new_tab_id}, Name: {new_tab_name}", file=sys.stderr, flush=True)
-
-            # 4. 회의 메타 정보 입력 (행2, 행3)
-            # 날짜/시간 포맷팅
-            formatted_date = meeting_date.replace("-", ".")
-            if meeting_time:
-                datetime_info = f"{formatted_date} / {meeting_time}"
-            else:
-                datetime_info = formatted_date
-
-            # 배치 업데이트
-            updates = [
-                {
-                    "range": f"'{new_tab_name}'!B2:C2",  # 회의 안건
-                    "values": [["회의 안건", meeting_title]]
-                },
-                {
-                    "range": f"'{new_tab_name}'!D3",  # 날짜/시간
-                    "values": [[datetime_info]]
-                }
-            ]
+            # 1. 템플릿 탭 정보 (최초 1회만 조회 후 재사용)
+            template_tab_id, template_tab_name = await self._get_template_tab(template_sheet_id)
+            logger.debug("템플릿 탭 ID: %s, 이름: %s", template_tab_id, template_tab_name)
 
-            # 장소 정보 (있는 경우)
-            if location:
-                updates.append({
-                    "range": f"'{new_tab_name}'!D4",
-                    "values": [[location]]
-                })
-
-            service.spreadsheets().values().batchUpdate(
-                spreadsheetId=template_sheet_id,
-                body={"data": updates, "valueInputOption": "RAW"}
-            ).execute()
-
-            print(f"[SUCCESS] Metadata updated for tab: {new_tab_name}", file=sys.stderr, flush=True)
-
-            # 5. 웹 링크 생성 (특정 탭으로 이동)
-            web_link = f"https://docs.google.com/spreadsheets/d/{template_sheet_id}/edit#gid={new_tab_id}"
-
-            return {
-                "file_id": template_sheet_id,  # 같은 파일
-                "tab_id": new_tab_id,  # 새 탭 ID
-                "tab_name": new_tab_name,  # 탭 이름
-                "web_link": web_link,
-                "created_time": datetime.now().isoformat()
-            }
+            # 2~4. 새 탭 이름/ID와 템플릿 복사 + 메타 정보 입력 요청 생성 (한 번의 batchUpdate로 처리)
+            new_tab_id, new_tab_name, requests = self._meeting_tab_requests(
+                template_tab_id, meeting_title, meeting_date, meeting_time, location
+            )
+            logger.debug("템플릿 탭 복사: '%s' -> '%s'", template_tab_name, new_tab_name)
+
+            try:
+                await self._execute(service.spreadsheets().batchUpdate(
+                    spreadsheetId=template_sheet_id,
+                    body={"requests": requests},
+                    fields="spreadsheetId"  # 응답의 replies(복사된 탭 전체 속성)는 사용하지 않음
+                ), idempotent=False)  # 이미 복사된 뒤 재시도하면 같은 newSheetId로 실패함
+            except HttpError as e:
+                # 템플릿 탭이 삭제/변경된 경우(400/404)에만 다음 호출에서 다시 조회
+                # (할당량 초과/일시 오류로는 캐시를 버리지 않음)
+                if e.resp.status in _TEMPLATE_STALE_STATUSES:
+                    self._template_tab = None
+                raise
+
+            logger.debug("회의록 탭 생성 완료 - ID: %s, 이름: %s", new_tab_id, new_tab_name)
+
+            # 5. 탭 정보 반환 (웹 링크는 특정 탭으로 이동)
+            return self._created_tab_info(template_sheet_id, new_tab_id, new_tab_name)
 
         except Exception as e:
-            import traceback
-            print(f"ERROR: {str(e)}")
-            print(f"TRACEBACK: {traceback.format_exc()}")
+            logger.exception("회의록 탭 생성 실패")
             raise Exception(f"회의록 탭 생성 실패: {str(e)}")
 
-    async def append_transcription_to_sheet(
-        self,
-        sheet_id: str,
-        tab_name: str,
-        transcription: str,
-        start_row: int = 13  # C13부터 시작
-    ) -> int:
+    async def create_meeting_sheets(self, meetings: List[Dict[str, Optional[str]]]) -> List[dict]:
         """
-        특정 탭의 C열에 녹취 내용 추가
+        여러 회의록 탭을 한 번의 batchUpdate로 생성
 
         Args:
-            sheet_id: Google Sheets 파일 ID
-            tab_name: 워크시트 탭 이름
-            transcription: 녹취 텍스트
-            start_row: 시작 행 번호 (기본값: 13)
+            meetings: create_meeting_sheet 인자와 같은 키를 가진 dict 목록
+                      (meeting_title 필수, meeting_date/meeting_time/location 선택)
 
         Returns:
-            추가된 행 번호
+            입력 순서대로 생성된 탭 정보 목록 (create_meeting_sheet 반환값과 동일한 형식)
 
         Raises:
-            Exception: API 호출 실패 시
+            Exception: API 호출 실패 시 (일부만 생성되는 경우 없음)
         """
+        if not meetings:
+            return []
+
         try:
             service = self._get_service()
+            template_sheet_id = settings.google_template_sheet_id
+            template_tab_id, _ = await self._get_template_tab(template_sheet_id)
+
+            tabs = []
+            requests = []
+            tab_names = set()
+            for meeting in meetings:
+                new_tab_id, new_tab_name, tab_requests = self._meeting_tab_requests(
+                    template_tab_id,
+                    meeting["meeting_title"],
+                    meeting.get("meeting_date"),
+                    meeting.get("meeting_time"),
+                    meeting.get("location"),
+                )
+                # 같은 제목이 같은 마이크로초에 만들어지면 탭 이름이 겹치므로 순번을 붙임
+                if new_tab_name in tab_names:
+                    new_tab_name = f"{new_tab_name} #{len(tabs) + 1}"
+                    tab_requests[0]["duplicateSheet"]["newSheetName"] = new_tab_name
+                tab_names.add(new_tab_name)
+                tabs.append((new_tab_id, new_tab_name))
+                requests.extend(tab_requests)
+
+            try:
+                await self._execute(service.spreadsheets().batchUpdate(
+                    spreadsheetId=template_sheet_id,
+                    body={"requests": requests},
+                    fields="spreadsheetId"  # 응답의 replies(복사된 탭 전체 속성)는 사용하지 않음
+                ), idempotent=False)  # 이미 복사된 뒤 재시도하면 같은 newSheetId로 실패함
+            except HttpError as e:
+                if e.resp.status in _TEMPLATE_STALE_STATUSES:
+                    self._template_tab = None
+                raise
+
+            logger.info(f"회의록 탭 {len(tabs)}개 일괄 생성 완료")
+            return [
+                self._created_tab_info(template_sheet_id, tab_id, tab_name)
+                for tab_id, tab_name in tabs
+            ]
 
-            # 현재 C열의 마지막 데이터 행 찾기
-            # C13부터 C1000까지 읽어서 마지막 비어있지 않은 행 찾기
-            range_to_read = f"'{tab_name}'!C{start_row}:C1000"
-            result = service.spreadsheets().values().get(
-                spreadsheetId=sheet_id,
-                range=range_to_read
-            ).execute()
+        except Exception as e:
+            raise Exception(f"회의록 탭 일괄 생성 실패: {str(e)}")
 
-            values = result.get("values", [])
+    def _meeting_tab_requests(
+        self,
+        template_tab_id: int,
+        meeting_title: str,
+        meeting_date: Optional[str],
+        meeting_time: Optional[str],
+        location: Optional[str],
+    ) -> Tuple[int, str, List[dict]]:
+        """
+        템플릿 탭 복사 + 회의 메타 정보 입력 요청 생성
 
-            # 다음 빈 행 계산
-            if values:
-                # 마지막 데이터가 있는 행의 다음 행
-                next_row = start_row + len(values)
-            else:
-                # 데이터가 없으면 start_row부터 시작
-                next_row = start_row
-
-            # C열에 녹취 내용 추가
-            range_to_update = f"'{tab_name}'!C{next_row}"
-            service.spreadsheets().values().update(
-                spreadsheetId=sheet_id,
-                range=range_to_update,
-                valueInputOption="RAW",
-                body={"values": [[transcription]]}
-            ).execute()
+        새 탭 ID를 직접 지정하여 같은 batchUpdate 안에서 updateCells가 참조할 수 있게 합니다.
 
-            print(f"SUCCESS: Transcription added to {range_to_update}")
-            return next_row
+        Returns:
+            (새 탭 ID, 새 탭 이름, batchUpdate 요청 목록 - 첫 항목이 duplicateSheet)
+        """
+        # 새 탭 이름 생성 (중복 방지를 위해 타임스탬프 추가)
+        if not meeting_date:
+            meeting_date = datetime.now().strftime("%Y-%m-%d")
+
+        # 마이크로초까지 포함한 타임스탬프로 중복 방지
+        timestamp = datetime.now().strftime("%H%M%S-%f")[:15]  # HHMMSS-mmmmmm 형식
+        new_tab_name = f"{meeting_date} {meeting_title} ({timestamp})"
+
+        # 회의 메타 정보 (날짜/시간 포맷팅)
+        formatted_date = meeting_date.replace("-", ".")
+        if meeting_time:
+            datetime_info = f"{formatted_date} / {meeting_time}"
+        else:
+            datetime_info = formatted_date
+
+        new_tab_id = secrets.randbelow(_MAX_SHEET_ID) + 1
+        requests = [
+            {
+                "duplicateSheet": {
+                    "sourceSheetId": template_tab_id,
+                    "newSheetId": new_tab_id,
+                    "newSheetName": new_tab_name
+                }
+            },
+            # 회의 안건 (B2:C2)
+            self._string_cells_request(new_tab_id, 1, 1, ["회의 안건", meeting_title]),
+            # 날짜/시간 (D3)
+            self._string_cells_request(new_tab_id, 2, 3, [datetime_info]),
+        ]
+
+        # 장소 정보 (있는 경우, D4)
+        if location:
+            requests.append(self._string_cells_request(new_tab_id, 3, 3, [location]))
+
+        return new_tab_id, new_tab_name, requests
+
+    def _created_tab_info(self, file_id: str, tab_id: int, tab_name: str) -> dict:
+        """생성된 탭 정보 반환 (새 탭의 녹취 영역은 비어 있으므로 다음 빈 행도 함께 지정)"""
+        # 첫 기록 시 C열 조회 생략
+        self._tab_next_row[(file_id, tab_name)] = _TRANSCRIPT_START_ROW
+
+        return {
+            "file_id": file_id,  # 같은 파일
+            "tab_id": tab_id,  # 새 탭 ID
+            "tab_name": tab_name,  # 탭 이름
+            "web_link": f"https://docs.google.com/spreadsheets/d/{file_id}/edit#gid={tab_id}",
+            "created_time": datetime.now().isoformat()
+        }
+
+    async def _get_template_tab(self, template_sheet_id: str) -> Tuple[int, str]:
+        """
+        템플릿 탭의 (sheetId, 이름) 반환 (탭 구성은 거의 바뀌지 않으므로 최초 조회 결과를 재사용)
 
-        except Exception as e:
-            raise Exception(f"녹취 내용 추가 실패: {str(e)}")
+        "템플릿" 또는 "Template" 이름을 가진 탭을 찾고, 없으면 첫 번째 탭을 사용합니다.
+        """
+        if self._template_tab is not None and self._template_tab[0] == template_sheet_id:
+            return self._template_tab[1], self._template_tab[2]
+
+        service = self._get_service()
+        logger.info("템플릿 시트 메타데이터 조회: %s", template_sheet_id)
+        sheet_metadata = await self._execute(service.spreadsheets().get(
+            spreadsheetId=template_sheet_id,
+            fields="sheets.properties(sheetId,title)"  # 탭 ID/이름만 조회
+        ))
+
+        sheets = sheet_metadata.get('sheets', [])
+        if not sheets:
+            raise Exception("템플릿 시트에 워크시트가 없습니다")
+
+        template_tab_id = None
+        template_tab_name = None
+
+        for sheet in sheets:
+            sheet_title = sheet['properties']['title']
+            if sheet_title in ['템플릿', 'Template', 'TEMPLATE', 'template']:
+                template_tab_id = sheet['properties']['sheetId']
+                template_tab_name = sheet_title
+                logger.info(f"템플릿 탭 발견: {template_tab_name} (ID: {template_tab_id})")
+                break
+
+        # 템플릿 탭을 못 찾으면 첫 번째 탭 사용
+        if template_tab_id is None:
+            template_tab_id = sheets[0]['properties']['sheetId']
+            template_tab_name = sheets[0]['properties']['title']
+            logger.warning(f"템플릿 탭 없음, 첫 번째 탭 사용: {template_tab_name} (ID: {template_tab_id})")
+
+        self._template_tab = (template_sheet_id, template_tab_id, template_tab_name)
+        return template_tab_id, template_tab_name
+
+    @staticmethod
+    def _string_cells_request(tab_id: int, row_index: int, column_index: int, values: List[str]) -> dict:
+        """한 행의 연속된 셀에 문자열을 그대로 입력하는 updateCells 요청 생성 (RAW 입력과 동일)"""
+        return {
+            "updateCells": {
+                "rows": [{
+                    "values": [{"userEnteredValue": {"stringValue": value or ""}} for value in values]
+                }],
+                "fields": "userEnteredValue",
+                "start": {"sheetId": tab_id, "rowIndex": row_index, "columnIndex": column_index},
+            }
+        }
 
-    async def append_transcription_with_speaker(
+    async def append_transcription_rows(
         self,
         sheet_id: str,
         tab_name: str,
-        text: str,
-        current_speaker: str,
-        last_speaker: Optional[str],
-        start_row: int = 13
-    ) -> dict:
+        rows: List[str],
+        start_row: int = 13  # C13부터 시작
+    ) -> int:
         """
-        화자 정보와 함께 녹취 내용 기록
-
-        포맷 규칙:
-        1. 화자가 바뀌면: 빈 줄 + [화자명] 텍스트
-        2. 같은 화자: 텍스트만 (화자명 생략)
+        특정 탭의 C열에 여러 줄의 녹취 내용을 한 번의 API 호출로 추가
 
         Args:
             sheet_id: Google Sheets 파일 ID
             tab_name: 워크시트 탭 이름
-            text: 녹취 텍스트
-            current_speaker: 현재 화자 ("홍길동" 또는 "Speaker 1")
-            last_speaker: 이전 화자 (None이면 첫 발화)
+            rows: 기록할 텍스트 목록 (한 줄에 하나씩)
             start_row: 시작 행 번호 (기본값: 13)
 
         Returns:
-            {
-                "row": 기록된 행 번호,
-                "speaker": 화자명,
-                "speaker_changed": 화자 변경 여부,
-                "formatted_text": 실제 기록된 텍스트
-            }
+            첫 번째 텍스트가 기록된 행 번호 (이후 텍스트는 연속된 행에 기록됨)
+
+        Raises:
+            Exception: API 호출 실패 시
         """
         try:
             service = self._get_service()
 
-            # 1. 현재 마지막 행 찾기
-            range_to_read = f"'{tab_name}'!C{start_row}:C1000"
-            result = service.spreadsheets().values().get(
-                spreadsheetId=sheet_id,
-                range=range_to_read
-            ).execute()
-
-            values = result.get("values", [])
-            current_row = start_row + len(values)
-
-            # 2. 화자 변경 감지
-            speaker_changed = (last_speaker != current_speaker)
-
-            # 3. 기록할 데이터 준비
-            rows_to_append = []
+            # 기록할 행 확보 (탭별 다음 빈 행은 처음 한 번만 시트에서 읽음)
+            next_row = await self._reserve_rows(sheet_id, tab_name, len(rows), start_row)
 
-            # 화자가 바뀌고 첫 발화가 아니면 빈 줄 추가
-            if speaker_changed and last_speaker is not None:
-                rows_to_append.append([""])
-
-            # 텍스트 포맷팅
-            if speaker_changed:
-                formatted_text = f"[{current_speaker}] {text}"
-            else:
-                formatted_text = text
+            # C열에 녹취 내용 추가 (여러 줄을 한 번에)
+            range_to_update = f"{_a1_prefix(tab_name)}C{next_row}:C{next_row + len(rows) - 1}"
+            try:
+                await self._execute(service.spreadsheets().values().update(
+                    spreadsheetId=sheet_id,
+                    range=range_to_update,
+                    valueInputOption="RAW",
+                    body={"values": [[row] for row in rows]}
+                ))
+            except Exception:
+                self._tab_next_row.pop((sheet_id, tab_name), None)
+                raise
 
-            rows_to_append.append([formatted_text])
+            logger.debug("녹취 내용 기록: %s", range_to_update)
+            return next_row
 
-            # 4. 시트에 기록
-            start_write_row = current_row
-            end_write_row = current_row + len(rows_to_append) - 1
+        except Exception as e:
+            raise Exception(f"녹취 내용 추가 실패: {str(e)}")
 
-            range_to_update = f"'{tab_name}'!C{start_write_row}:C{end_write_row}"
+    async def _reserve_rows(self, sheet_id: str, tab_name: str, count: int, start_row: int) -> int:
+        """
+        탭의 C열에서 count개 행을 확보하고 첫 행 번호 반환
 
-            service.spreadsheets().values().update(
+        다음 빈 행은 탭별로 메모리에 유지하며, 모를 때(서버 재시작, 기록 실패 후)만
+        C{start_row}:C를 읽어 계산합니다 (응답은 마지막 값이 있는 행까지만 포함).
+        녹취에는 화자 구분용 빈 줄이 섞여 있어 values.append의 표 감지에 맡기지 않습니다.
+        """
+        key = (sheet_id, tab_name)
+        next_row = self._tab_next_row.get(key)
+        if next_row is None:
+            service = self._get_service()
+            result = await self._execute(service.spreadsheets().values().get(
                 spreadsheetId=sheet_id,
-                range=range_to_update,
-                valueInputOption="RAW",
-                body={"values": rows_to_append}
-            ).execute()
+                range=f"{_a1_prefix(tab_name)}C{start_row}:C",
+                fields="values"
+            ))
+            # 마지막 데이터가 있는 행의 다음 행 (데이터가 없으면 start_row)
+            read_row = start_row + len(result.get("values", []))
+            # 읽는 동안 다른 기록이 먼저 행을 확보했으면 그 값을 따름
+            next_row = self._tab_next_row.get(key, read_row)
+
+        # 기록 API 호출 전에 미리 확보하여 동시 기록이 같은 행을 쓰지 않도록 함
+        self._tab_next_row[key] = next_row + count
+        return next_row
+
+    @staticmethod
+    def format_speaker_rows(
+        text: str,
+        current_speaker: str,
+        last_speaker: Optional[str]
+    ) -> Tuple[List[str], bool]:
+        """
+        화자 포맷 규칙에 따라 기록할 행 목록 생성
 
-            logger.info(
-                f"녹취 기록 완료 - 화자: {current_speaker}, "
-                f"행: {start_write_row}, 변경: {speaker_changed}"
-            )
+        1. 화자가 바뀌면: 빈 줄 + [화자명] 텍스트 (첫 발화는 빈 줄 없음)
+        2. 같은 화자: 텍스트만 (화자명 생략)
 
-            return {
-                "row": start_write_row,
-                "speaker": current_speaker,
-                "speaker_changed": speaker_changed,
-                "formatted_text": formatted_text
-            }
+        Returns:
+            (기록할 행 목록, 화자 변경 여부) - 텍스트는 항상 마지막 행
+        """
+        speaker_changed = (last_speaker != current_speaker)
 
-        except Exception as e:
-            logger.error(f"녹취 기록 실패: {e}")
-            raise Exception(f"녹취 기록 실패: {str(e)}")
+        if not speaker_changed:
+            return [text], False
+
+        rows = [] if last_speaker is None else [""]
+        rows.append(_speaker_prefix(current_speaker) + text)
+        return rows, True
 
-    async def update_speaker_labels(
+    async def batch_update_speaker_labels(
         self,
         sheet_id: str,
-        tab_name: str,
-        old_label: str,
-        new_label: str,
+        tab_id: int,
+        labels: Dict[str, str],
         start_row: int = 13
     ) -> int:
         """
-        화자 레이블 일괄 업데이트
+        여러 화자 레이블을 한 번의 batchUpdate 호출로 변경
 
-        예: "[Speaker 1]" → "[홍길동]"
+        레이블마다 C열(start_row 이후) 대상 findReplace 요청을 만들어 함께 전송합니다.
+        요청은 순서대로 적용되므로 연쇄 매핑(Speaker 1→Speaker 2, Speaker 2→홍길동)이
+        앞 결과를 다시 바꾸지 않도록, 먼저 모든 기존 레이블을 고유 토큰으로 바꾼 뒤
+        토큰을 새 레이블로 바꿉니다.
+        예: {"Speaker 1": "홍길동", "Speaker 2": "김철수"}
 
         Args:
             sheet_id: Google Sheets 파일 ID
-            tab_name: 워크시트 탭 이름
-            old_label: 기존 레이블 ("Speaker 1")
-            new_label: 새 레이블 ("홍길동")
+            tab_id: 워크시트 탭 ID (sheetId)
+            labels: {기존 레이블: 새 레이블}
             start_row: 시작 행 번호 (기본값: 13)
 
         Returns:
             업데이트된 행 개수
         """
+        if not labels:
+            return 0
+
         try:
             service = self._get_service()
+            label_range = {
+                "sheetId": tab_id,
+                "startRowIndex": start_row - 1,
+                "startColumnIndex": 2,  # C열
+                "endColumnIndex": 3,
+            }
 
-            # 1. 전체 데이터 읽기
-            range_to_read = f"'{tab_name}'!C{start_row}:C1000"
-            result = service.spreadsheets().values().get(
-                spreadsheetId=sheet_id,
-                range=range_to_read
-            ).execute()
-
-            values = result.get("values", [])
-            if not values:
-                return 0
-
-            # 2. 레이블 찾아서 변경
-            updated_count = 0
-            updated_values = []
-
-            old_prefix = f"[{old_label}]"
-            new_prefix = f"[{new_label}]"
-
-            for row in values:
-                if not row:
-                    updated_values.append(row)
-                    continue
-
-                cell_value = row[0]
-
-                # "[Speaker 1] 텍스트" → "[홍길동] 텍스트"
-                if cell_value.startswith(old_prefix):
-                    new_value = cell_value.replace(old_prefix, new_prefix, 1)
-                    updated_values.append([new_value])
-                    updated_count += 1
-                else:
-                    updated_values.append(row)
-
-            # 3. 업데이트
-            if updated_count > 0:
-                range_to_update = f"'{tab_name}'!C{start_row}:C{start_row + len(updated_values) - 1}"
-
-                service.spreadsheets().values().update(
-                    spreadsheetId=sheet_id,
-                    range=range_to_update,
-                    valueInputOption="RAW",
-                    body={"values": updated_values}
-                ).execute()
+            def find_replace(old_prefix: str, new_prefix: str) -> dict:
+                # 행 맨 앞의 접두어만 치환 (본문 중의 같은 문자열은 유지)
+                return {
+                    "findReplace": {
+                        "find": f"^{re.escape(old_prefix)}",
+                        "replacement": _quote_replacement(new_prefix),
+                        "searchByRegex": True,
+                        "range": label_range,
+                    }
+                }
 
-                logger.info(f"화자 레이블 업데이트 완료: {updated_count}개 행")
+            # 1단계: "[Speaker 1]" → 고유 토큰, 2단계: 토큰 → "[홍길동]"
+            nonce = secrets.token_hex(4)
+            tokens = [f"[{_LABEL_TOKEN_PREFIX}{nonce}-{index}]" for index in range(len(labels))]
+            requests = [
+                find_replace(f"[{old_label}]", token)
+                for old_label, token in zip(labels, tokens)
+            ] + [
+                find_replace(token, f"[{new_label}]")
+                for token, new_label in zip(tokens, labels.values())
+            ]
 
+            # 새 레이블이 다른 기존 레이블과 같으면(연쇄 매핑) 다시 실행했을 때 결과가 달라지므로 5xx 재시도 안 함
+            chained = not labels.keys().isdisjoint(labels.values())
+            response = await self._execute(service.spreadsheets().batchUpdate(
+                spreadsheetId=sheet_id,
+                body={"requests": requests},
+                fields="replies/findReplace/rowsChanged"
+            ), idempotent=not chained)
+
+            # 실제로 새 레이블이 기록된 2단계 응답만 집계
+            updated_count = sum(
+                reply.get("findReplace", {}).get("rowsChanged", 0)
+                for reply in response.get("replies", [])[len(labels):]
+            )
+            logger.info(f"화자 레이블 일괄 업데이트 완료: {len(labels)}개 레이블, {updated_count}개 행")
             return updated_count
 
         except Exception as e:
-            logger.error(f"레이블 업데이트 실패: {e}")
+            logger.error(f"레이블 일괄 업데이트 실패: {e}")
             return 0
 
-
 # 싱글톤 인스턴스
 sheets_service = GoogleSheetsService()
@@ -3,14 +3,60 @@ Google Cloud Speech-to-Text API 서비스 (화자 분리 기능)
 """
 
 from google.cloud import speech_v1p1beta1 as speech
+from google.cloud.speech_v1p1beta1.services.speech.transports import SpeechGrpcTransport
 import asyncio
-import queue
+import concurrent.futures
 import logging
-from typing import AsyncGenerator, Dict, Optional
+import threading
+import time
+from typing import Optional
 from app.config.settings import settings
+from app.services import google_api
 
 logger = logging.getLogger(__name__)
 
+# StreamingRecognizeRequest 하나에 담을 오디오 최대 크기 (Speech API 요청당 한도 25,600 bytes)
+_MAX_REQUEST_AUDIO_BYTES = 25600
+
+# 스트리밍 인식 한 번의 최대 길이(약 5분)에 걸리기 전에 새 스트림으로 교체하는 주기 (초)
+# 이 시간이 지난 뒤 처음 도착하는 Cluster 경계에서 교체 (MediaRecorder는 수 초마다 Cluster 생성)
+_STREAM_ROTATE_SEC = 240
+
+# 스트림 교체 알림 (응답 큐에서 이전 스트림의 마지막 응답 다음에 들어감)
+_ROTATED = object()
+
+# 오디오 큐 종료 신호 (stop()이 넣으면 요청 제너레이터가 즉시 종료)
+_STOP = object()
+
+# WebM Cluster 요소 ID (첫 Cluster 앞까지가 헤더: EBML + Segment 정보 + Tracks)
+_WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"
+
+
+# Cluster의 첫 자식 요소인 Timecode 요소 ID
+_WEBM_TIMECODE_ID = 0xE7
+
+# 첫 Cluster를 찾기 위해 모아 둘 선두 바이트 상한 (헤더는 보통 수백 바이트)
+_WEBM_HEADER_SCAN_MAX = 64 * 1024
+
+
+def _find_cluster(data: bytes) -> int:
+    """
+    data에서 Cluster 요소가 시작하는 위치 반환 (없으면 -1)
+
+    Opus 프레임 안에 같은 4바이트가 우연히 나올 수 있으므로
+    크기 필드(EBML 가변 길이 정수) 바로 다음에 Timecode 요소가 오는 경우만 인정합니다.
+    """
+    index = data.find(_WEBM_CLUSTER_ID)
+    while index >= 0:
+        size_pos = index + len(_WEBM_CLUSTER_ID)
+        if size_pos < len(data) and data[size_pos]:
+            # 첫 바이트의 선행 0 비트 수 + 1 = 크기 필드 길이
+            child_pos = size_pos + 9 - data[size_pos].bit_length()
+            if child_pos < len(data) and data[child_pos] == _WEBM_TIMECODE_ID:
+                return index
+        index = data.find(_WEBM_CLUSTER_ID, index + 1)
+    return -1
+
 
 class SpeechService:
     """Google Speech-to-Text API 서비스 (화자 분리 기능)"""
@@ -18,7 +64,17 @@ class SpeechService:
     def __init__(self):
         """Speech API 클라이언트 초기화"""
         try:
-            self.client = speech.SpeechClient()
+            # 키 파일이 지정되어 있으면 다른 Google 서비스와 인증 정보를 공유 (없으면 기본 인증)
+            credentials = None
+            if settings.google_application_credentials:
+                credentials = google_api.get_credentials(
+                    settings.google_application_credentials, google_api.CLOUD_PLATFORM_SCOPES
+                )
+            # 회의 중 오래 유지되는 스트림이므로 keepalive 채널 사용
+            channel = SpeechGrpcTransport.create_channel(
+                credentials=credentials, options=list(google_api.GRPC_CHANNEL_OPTIONS)
+            )
+            self.client = speech.SpeechClient(transport=SpeechGrpcTransport(channel=channel))
             logger.info("Speech API 클라이언트 초기화 완료")
         except Exception as e:
             logger.error(f"Speech API 클라이언트 초기화 실패: {e}")
@@ -89,86 +145,204 @@ class SpeechStreamingSession:
     def __init__(self, client, streaming_config):
         self.client = client
         self.streaming_config = streaming_config
-        self.audio_queue = queue.Queue()  # 동기 큐로 변경
+        # 크기 제한 큐: 가득 차면 send_audio가 대기하여 WebSocket 수신 쪽으로 역압 전달
+        self.audio_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.speech_audio_queue_max)
+        self._queue_warn_size = max(1, settings.speech_audio_queue_max * 4 // 5)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._carry = None  # 요청 크기 한도로 다음 요청에 넘긴 청크 (또는 _STOP)
+        self._pending_audio: Optional[concurrent.futures.Future] = None  # 대기 중인 큐 조회 (스트림 교체 시 유지)
+        self._webm_header: Optional[bytes] = None  # 스트림 교체 시 새 스트림 앞에 다시 보낼 헤더
+        self._header_scan: Optional[bytearray] = bytearray()  # 첫 Cluster 전까지의 선두 바이트 (확정/포기 후 None)
+        self._rotate_carry: Optional[bytes] = None  # 교체 지점(Cluster 시작)부터 새 스트림에 보낼 오디오
         self.is_running = False
         self.response_task = None
 
-    def request_generator(self):
-        """오디오 요청 제너레이터 (오디오만 전송)"""
-        import sys
-        print("[INFO] request_generator started", file=sys.stderr, flush=True)
+    def request_generator(self, deadline: Optional[float] = None):
+        """
+        오디오 요청 제너레이터 (오디오만 전송)
+
+        deadline 이후 처음 도착한 Cluster 경계에서 멈추고, Cluster 시작부터의 오디오는
+        _rotate_carry에 남겨 다음 스트림이 WebM 헤더 바로 다음에 보내게 합니다.
+        (Cluster 중간의 SimpleBlock부터 시작하는 스트림은 디코딩할 수 없음)
+
+        Args:
+            deadline: time.monotonic() 기준 교체 시각 (None이면 세션 종료까지)
+        """
+        logger.debug("request_generator 시작")
+
+        # 교체된 스트림은 WebM 헤더 + 이전 스트림에서 넘긴 Cluster 시작부터 전송
+        if self._rotate_carry is not None:
+            carry, self._rotate_carry = self._rotate_carry, None
+            yield speech.StreamingRecognizeRequest(audio_content=self._webm_header)
+            yield speech.StreamingRecognizeRequest(audio_content=carry)
 
         # 오디오만 전송 (config는 streaming_recognize의 첫 번째 인자로 전달)
         chunk_count = 0
         while self.is_running:
+            # 이벤트 루프의 큐에서 꺼내는 요청 (폴링 없이 청크가 들어올 때까지 대기)
+            self._pending_audio = asyncio.run_coroutine_threadsafe(self._next_audio(), self.loop)
             try:
-                # 큐에서 오디오 청크 가져오기 (0.5초 타임아웃)
-                audio_chunk = self.audio_queue.get(timeout=0.5)
-                if audio_chunk is not None:
-                    chunk_count += 1
-                    print(f"[SEND] Audio chunk to Speech API: {len(audio_chunk)} bytes (#{chunk_count})", file=sys.stderr, flush=True)
-                    yield speech.StreamingRecognizeRequest(
-                        audio_content=audio_chunk
-                    )
-            except queue.Empty:
-                # 큐가 비어있으면 계속 대기
-                if chunk_count == 0:
-                    print(f"[WAIT] Waiting for first audio... (is_running={self.is_running})", file=sys.stderr, flush=True)
-                continue
-
-        print(f"[STOP] request_generator finished (total {chunk_count} chunks sent)", file=sys.stderr, flush=True)
-
-    async def start_immediately(self, result_callback):
+                audio_chunk = self._pending_audio.result()
+            except concurrent.futures.CancelledError:
+                break
+            finally:
+                self._pending_audio = None
+
+            if audio_chunk is _STOP:
+                break
+
+            if self._header_scan is not None:
+                self._scan_header(audio_chunk)
+            elif (
+                deadline is not None
+                and self._webm_header is not None
+                and time.monotonic() >= deadline
+            ):
+                index = _find_cluster(audio_chunk)
+                if index >= 0:
+                    # Cluster 앞부분까지만 현재 스트림에 보내고 교체
+                    self._rotate_carry = audio_chunk[index:]
+                    if index:
+                        yield speech.StreamingRecognizeRequest(audio_content=audio_chunk[:index])
+                    break
+            chunk_count += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Speech API로 오디오 전송: %d bytes (#%d)", len(audio_chunk), chunk_count)
+            yield speech.StreamingRecognizeRequest(
+                audio_content=audio_chunk
+            )
+
+        logger.debug("request_generator 종료 (총 %d개 청크 전송)", chunk_count)
+
+    def _scan_header(self, audio_chunk: bytes) -> None:
+        """
+        세션 선두 바이트를 모아 첫 Cluster 앞까지를 WebM 헤더로 확정
+
+        헤더는 세션의 첫 Cluster 앞에서만 찾고, 한 번 정해지면 바꾸지 않습니다.
+        (중간 청크의 Cluster 앞부분은 이전 Cluster의 SimpleBlock 조각이라 헤더가 아님)
+        """
+        self._header_scan.extend(audio_chunk)
+        index = _find_cluster(self._header_scan)
+        if index > 0:
+            self._webm_header = bytes(self._header_scan[:index])
+            self._header_scan = None
+        elif index == 0 or len(self._header_scan) > _WEBM_HEADER_SCAN_MAX:
+            self._header_scan = None
+            logger.warning(
+                "WebM 헤더를 찾지 못해 스트림 교체 불가 - 스트리밍 시간 제한에 도달하면 인식이 종료됩니다"
+            )
+
+    async def _next_audio(self):
+        """
+        다음 요청에 보낼 오디오 반환 (이벤트 루프에서 실행, 종료 신호면 _STOP)
+
+        이미 큐에 쌓인 청크는 요청 크기 한도까지 이어 붙여 gRPC 메시지 수를 줄입니다.
+        기다리는 청크가 없으면 받은 청크를 그대로 보내므로 지연은 늘지 않습니다.
+        """
+        if self._carry is not None:
+            chunk, self._carry = self._carry, None
+        else:
+            chunk = await self.audio_queue.get()
+
+        if chunk is _STOP or self.audio_queue.empty():
+            return chunk
+
+        buffer = bytearray(chunk)
+        while not self.audio_queue.empty():
+            next_chunk = self.audio_queue.get_nowait()
+            if next_chunk is _STOP or len(buffer) + len(next_chunk) > _MAX_REQUEST_AUDIO_BYTES:
+                self._carry = next_chunk
+                break
+            buffer += next_chunk
+        return bytes(buffer)
+
+    async def start_immediately(self, result_callback, rotation_callback=None):
         """
         즉시 스트리밍 시작 (첫 오디오 대기 없음)
 
         Args:
             result_callback: 결과를 받을 async 함수 (result dict를 인자로 받음)
+            rotation_callback: 스트림이 교체될 때 호출할 async 함수 (인자 없음)
+                               새 스트림은 화자 번호(speaker_tag)를 처음부터 다시 매기므로
+                               이전 화자 매핑을 버려야 합니다.
         """
         if self.is_running:
             logger.warning("이미 실행 중인 세션입니다")
             return
 
         self.is_running = True
+        self.loop = asyncio.get_running_loop()
         logger.info("🎙️ Speech API 스트리밍 세션 즉시 시작!")
 
         # 응답 처리 태스크 시작
         self.response_task = asyncio.create_task(
-            self._process_responses(result_callback)
+            self._process_responses(result_callback, rotation_callback)
         )
 
-    async def _process_responses(self, result_callback):
-        """Speech API 응답 처리 (실시간 스트리밍)"""
-        loop = asyncio.get_event_loop()
+    def _drain_responses(self, loop: asyncio.AbstractEventLoop, responses: asyncio.Queue) -> None:
+        """
+        전용 스레드에서 gRPC 응답 스트림을 읽어 이벤트 루프의 큐로 전달
 
+        스트림 길이 제한(약 5분)에 걸리기 전에 _STREAM_ROTATE_SEC 이후의 첫 Cluster 경계에서
+        요청 스트림을 닫고 새 스트림을 엽니다. 오디오 큐는 그대로 유지되므로 교체 중 들어온 오디오도
+        이어서 전송됩니다. 교체하면 _ROTATED를 넣고(새 스트림은 화자 번호를 새로 매김),
+        세션이 끝나면 None, 오류가 나면 예외 객체를 마지막으로 넣습니다.
+        """
+        end = None
         try:
-            # 제너레이터를 반환하는 함수
-            def create_response_generator():
-                """동기 API 호출 - 제너레이터 반환"""
+            while self.is_running:
+                deadline = time.monotonic() + _STREAM_ROTATE_SEC
                 # v1p1beta1: streaming_config와 requests 2개 인자 필요
-                return self.client.streaming_recognize(
+                for response in self.client.streaming_recognize(
                     self.streaming_config,
-                    self.request_generator()
-                )
+                    self.request_generator(deadline)
+                ):
+                    loop.call_soon_threadsafe(responses.put_nowait, response)
 
-            # 별도 스레드에서 제너레이터 생성
-            response_generator = await loop.run_in_executor(None, create_response_generator)
+                # Cluster 경계에서 끊은 경우에만 교체 (그 외에는 이어서 보낼 지점이 없으므로 종료)
+                if not self.is_running or self._rotate_carry is None:
+                    break
+                logger.info("Speech API 스트림 교체")
+                loop.call_soon_threadsafe(responses.put_nowait, _ROTATED)
+        except Exception as e:
+            end = e
+        finally:
+            if self._pending_audio is not None:
+                self._pending_audio.cancel()
+                self._pending_audio = None
+
+        try:
+            loop.call_soon_threadsafe(responses.put_nowait, end)
+        except RuntimeError:
+            # 이벤트 루프가 이미 종료됨 (앱 종료 중)
+            pass
+
+    async def _process_responses(self, result_callback, rotation_callback=None):
+        """Speech API 응답 처리 (실시간 스트리밍)"""
+        loop = asyncio.get_running_loop()
+        responses: asyncio.Queue = asyncio.Queue()
 
-            # 응답을 하나씩 실시간으로 처리
-            def get_next_response():
-                """다음 응답 가져오기 (블로킹)"""
-                try:
-                    return next(response_generator)
-                except StopIteration:
-                    return None
+        try:
+            # 블로킹 gRPC 스트림은 세션 전용 스레드가 읽음 (기본 스레드 풀을 점유하지 않음)
+            threading.Thread(
+                target=self._drain_responses,
+                args=(loop, responses),
+                name="speech-stream",
+                daemon=True,
+            ).start()
 
             while self.is_running:
-                # 다음 응답 기다리기 (별도 스레드에서)
-                response = await loop.run_in_executor(None, get_next_response)
+                response = await responses.get()
 
                 if response is None:
                     logger.info("Speech API 스트림 종료")
                     break
+                if isinstance(response, Exception):
+                    raise response
+                if response is _ROTATED:
+                    if rotation_callback is not None:
+                        await rotation_callback()
+                    continue
 
                 if not response.results:
                     continue
@@ -207,17 +381,26 @@ class SpeechStreamingSession:
             logger.info("Speech API 응답 처리 종료")
 
     async def send_audio(self, audio_chunk: bytes):
-        """오디오 청크를 큐에 추가 (스트림 시작 전에도 가능)"""
-        # 동기 큐에 추가 (논블로킹)
-        self.audio_queue.put(audio_chunk)
+        """오디오 청크를 큐에 추가 (스트림 시작 전에도 가능, 큐가 가득 차면 빈 자리가 날 때까지 대기)"""
+        await self.audio_queue.put(audio_chunk)
         queue_size = self.audio_queue.qsize()
-        logger.info(f"✅ 오디오 청크 큐에 추가: {len(audio_chunk)} bytes (큐 크기: {queue_size})")
+        if queue_size == self._queue_warn_size:
+            logger.warning(f"오디오 큐 80% 이상 사용 중: {queue_size}/{self.audio_queue.maxsize}")
+        else:
+            logger.debug("오디오 청크 큐에 추가: %d bytes (큐 크기: %d)", len(audio_chunk), queue_size)
 
     async def stop(self):
         """스트리밍 종료"""
         logger.info("Speech API 스트리밍 세션 종료")
         self.is_running = False
 
+        # 청크를 기다리던 요청 제너레이터를 바로 깨움
+        # (큐가 가득 찼다면 제너레이터가 소비 중이므로 다음 청크 후 is_running을 보고 종료)
+        try:
+            self.audio_queue.put_nowait(_STOP)
+        except asyncio.QueueFull:
+            pass
+
         # 응답 처리 태스크 대기
         if self.response_task:
             try:
@@ -1,10 +1,17 @@
 import asyncio
+import logging
+import queue
+import threading
 from typing import AsyncGenerator, Optional
 
 from google.cloud import speech
-from google.oauth2 import service_account
 
-from app.config.settings import settings
+from app.services.transcribe_service import get_speech_client, resolve_language_code
+
+logger = logging.getLogger(__name__)
+
+# 인식 스레드가 끝났음을 알리는 표시
+_DONE = object()
 
 
 class StreamingTranscribeService:
@@ -14,39 +21,33 @@ class StreamingTranscribeService:
         self.client = None
 
     def _get_client(self):
-        """Google Speech 클라이언트를 lazy initialization으로 생성"""
+        """Google Speech 클라이언트를 lazy initialization으로 가져옴 (프로세스 공유)"""
         if self.client is None:
-            credentials = service_account.Credentials.from_service_account_file(
-                settings.google_application_credentials
-            )
-            self.client = speech.SpeechClient(credentials=credentials)
+            self.client = get_speech_client()
         return self.client
 
     async def transcribe_stream(
         self,
         audio_generator: AsyncGenerator[bytes, None],
         language: str = "ko",
+        interim_results: bool = False,
     ) -> AsyncGenerator[str, None]:
         """
         오디오 스트림을 실시간으로 텍스트로 변환
 
+        블로킹 gRPC 스트림은 전용 스레드에서 읽고, 오디오 청크는 스레드 안전 큐로 넘기므로
+        인식 중에도 이벤트 루프가 막히지 않습니다. 결과는 도착하는 즉시 전달됩니다.
+
         Args:
-            audio_generator: 오디오 청크를 생성하는 비동기 제너레이터
+            audio_generator: 16kHz LINEAR16 오디오 청크를 생성하는 비동기 제너레이터
             language: 음성 언어 코드 (기본값: ko)
+            interim_results: True면 확정 전 중간 결과도 전달
 
         Yields:
             실시간으로 변환된 텍스트 청크
         """
         client = self._get_client()
-
-        # 언어 코드 매핑
-        language_code_map = {
-            "ko": "ko-KR",
-            "en": "en-US",
-            "ja": "ja-JP",
-            "zh": "zh-CN",
-        }
-        language_code = language_code_map.get(language, f"{language}-KR")
+        language_code = resolve_language_code(language)
 
         # 스트리밍 설정
         config = speech.StreamingRecognitionConfig(
@@ -57,35 +58,62 @@ class StreamingTranscribeService:
                 enable_automatic_punctuation=True,
                 model="default",
             ),
-            interim_results=False,  # 중간 결과는 사용하지 않음 (종료 후 처리)
+            interim_results=interim_results,
+            single_utterance=False,
         )
 
-        # 동기 제너레이터를 비동기로 래핑
-        def sync_audio_generator():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        loop = asyncio.get_running_loop()
+        audio_chunks: "queue.Queue[Optional[bytes]]" = queue.Queue()  # None이면 오디오 끝
+        results: asyncio.Queue = asyncio.Queue()
+
+        def requests():
+            while True:
+                chunk = audio_chunks.get()
+                if chunk is None:
+                    return
+                yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+        def recognize():
+            # 전용 스레드: 응답을 읽어 이벤트 루프의 큐로 전달 (끝나면 _DONE, 오류면 예외 객체)
+            end = _DONE
+            try:
+                for response in client.streaming_recognize(config, requests()):
+                    for result in response.results:
+                        if result.alternatives and (result.is_final or interim_results):
+                            loop.call_soon_threadsafe(
+                                results.put_nowait, result.alternatives[0].transcript
+                            )
+            except Exception as e:
+                end = e
+            try:
+                loop.call_soon_threadsafe(results.put_nowait, end)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료됨 (앱 종료 중)
+                pass
+
+        async def feed():
             try:
-                async_gen = audio_generator.__aiter__()
-                while True:
-                    try:
-                        chunk = loop.run_until_complete(async_gen.__anext__())
-                        yield speech.StreamingRecognizeRequest(audio_content=chunk)
-                    except StopAsyncIteration:
-                        break
+                async for chunk in audio_generator:
+                    audio_chunks.put_nowait(chunk)
             finally:
-                loop.close()
-
-        # 스트리밍 인식 수행
-        requests = sync_audio_generator()
-        responses = client.streaming_recognize(config, requests)
-
-        # 결과 처리
-        for response in responses:
-            for result in response.results:
-                if result.is_final:
-                    transcript = result.alternatives[0].transcript
-                    print(f"DEBUG: Streaming transcription: {transcript}")
-                    yield transcript
+                audio_chunks.put_nowait(None)
+
+        threading.Thread(target=recognize, name="speech-transcribe-stream", daemon=True).start()
+        feed_task = asyncio.create_task(feed())
+
+        try:
+            while True:
+                item = await results.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                logger.debug("스트리밍 인식 결과: %s", item)
+                yield item
+        finally:
+            # 소비자가 중간에 멈춰도 요청 스트림을 닫아 인식 스레드가 끝나도록 함
+            feed_task.cancel()
+            audio_chunks.put_nowait(None)
 
 
 # 싱글톤 인스턴스
@@ -1,14 +1,250 @@
+import asyncio
+import hashlib
 import io
+import logging
+import os
+import struct
 import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import BinaryIO, Optional
+from types import MappingProxyType
+from typing import List, Optional
 
 import librosa
+import numpy as np
 import soundfile as sf
+import soxr
+from google.api_core import exceptions as gapi_exceptions
 from google.cloud import speech
-from google.oauth2 import service_account
+from google.cloud.speech_v1.services.speech.transports import SpeechGrpcTransport
 
 from app.config.settings import settings
+from app.services import google_api
+
+logger = logging.getLogger(__name__)
+
+# 리샘플링 품질 (음성 인식용 16kHz 변환에는 soxr 중간 품질로 충분하고 HQ보다 빠름)
+_RESAMPLE_QUALITY = "MQ"
+
+# 오디오 변환(디코딩/리샘플링) 전용 스레드 풀
+# CPU 작업이므로 코어 수에 맞추고, 기본 풀(asyncio.to_thread)의 Speech 호출과 분리
+_CONVERT_WORKERS = max(2, (os.cpu_count() or 2) - 1)
+_convert_pool = ThreadPoolExecutor(max_workers=_CONVERT_WORKERS, thread_name_prefix="audio-conv")
+
+# 변환 결과 캐시 (재시도/재업로드 시 같은 파일을 다시 디코딩하지 않음): 최대 항목 수 / 전체 크기
+_CONVERT_CACHE_MAX_ENTRIES = 64
+_CONVERT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# recognize(동기 인식)에 인라인으로 보낼 수 있는 한도 (API 한도 60초/10MB보다 약간 낮게)
+_INLINE_MAX_DURATION_SEC = 55
+_INLINE_MAX_BYTES = 9_000_000
+
+# long_running_recognize 결과 대기 시간 / 완료 여부 확인 간격 (초)
+_LONG_RUNNING_TIMEOUT_SEC = 1800
+_LONG_RUNNING_POLL_SEC = 2.0
+
+# 긴 오디오 GCS 업로드: 재개 가능 업로드 구간 크기 (256KB 배수) / 구간별 요청 타임아웃 (초)
+_GCS_UPLOAD_CHUNK_BYTES = 8 * 1024 * 1024
+_GCS_UPLOAD_TIMEOUT_SEC = 120
+
+# 긴 16kHz PCM 오디오 분할 인식: 구간 길이 / 앞 구간과 겹치는 길이 / 무음 지점을 찾는 범위 (초)
+_CHUNK_SEC = 30
+_CHUNK_OVERLAP_SEC = 0.5
+_CHUNK_CUT_SEARCH_SEC = 1.0
+_PCM_RATE = 16000
+_ENERGY_FRAME = 320  # 20ms (무음 지점 탐색 단위)
+
+# Speech API 호출 재시도 (할당량 초과/일시 오류): 최대 시도 횟수, 지수 백오프 시작/최대 대기 (초)
+_SPEECH_MAX_ATTEMPTS = 3
+_SPEECH_RETRY_MIN_SEC = 0.5
+_SPEECH_RETRY_MAX_SEC = 8.0
+_SPEECH_RETRYABLE = (
+    gapi_exceptions.ResourceExhausted,
+    gapi_exceptions.DeadlineExceeded,
+    gapi_exceptions.ServiceUnavailable,
+)
+
+
+# 언어 코드 매핑 (ko -> ko-KR, en -> en-US)
+_LANGUAGE_CODES = MappingProxyType({
+    "ko": "ko-KR",
+    "en": "en-US",
+    "ja": "ja-JP",
+    "zh": "zh-CN",
+})
+
+
+def resolve_language_code(language: Optional[str]) -> str:
+    """
+    짧은 언어 코드를 Speech API 언어 코드로 변환 (ko -> ko-KR)
+
+    이미 지역이 포함된 코드(ko-KR, en-GB 등)는 그대로 사용합니다.
+    """
+    if not language:
+        return _LANGUAGE_CODES["ko"]
+    code = _LANGUAGE_CODES.get(language)
+    if code is not None:
+        return code
+    return language if "-" in language else f"{language}-KR"
+
+
+_Encoding = speech.RecognitionConfig.AudioEncoding
+
+# 파일 확장자별 (인식 인코딩, FLAC 변환이 필요한 경우 원본 형식)
+# 변환 결과는 16kHz mono FLAC (무손실, 16-bit PCM WAV의 약 절반 크기로 전송량 감소)
+_DEFAULT_ENCODING = (_Encoding.LINEAR16, None)
+_EXT_ENCODINGS = MappingProxyType({
+    ".mp3": (_Encoding.FLAC, "mp3"),
+    ".m4a": (_Encoding.FLAC, "m4a"),
+    ".wav": (_Encoding.LINEAR16, None),
+    ".flac": (_Encoding.FLAC, None),
+    ".ogg": (_Encoding.OGG_OPUS, None),
+    ".webm": (_Encoding.WEBM_OPUS, None),
+})
+
+
+@lru_cache(maxsize=64)
+def _recognition_config(encoding: int, language_code: str) -> speech.RecognitionConfig:
+    """인식 설정 반환 (인코딩/언어 조합별로 공유, 호출하는 쪽에서 수정하지 않음)"""
+    return speech.RecognitionConfig(
+        encoding=encoding,
+        sample_rate_hertz=16000,  # 변환 시 16kHz로 설정
+        language_code=language_code,
+        enable_automatic_punctuation=True,  # 자동 문장 부호
+        model="default",  # 기본 모델
+        use_enhanced=False,  # 향상된 모델 사용 (비용 발생)
+    )
+
+
+def _pcm16_payload(wav: bytes) -> Optional[memoryview]:
+    """
+    16kHz mono 16-bit PCM WAV이면 data 청크(헤더 제외) 반환, 아니면 None
+
+    RIFF 청크를 순서대로 읽어 fmt/data를 찾으므로 추가 청크(LIST 등)가 있어도 동작합니다.
+    """
+    if len(wav) < 12 or wav[:4] != b"RIFF" or wav[8:12] != b"WAVE":
+        return None
+
+    view = memoryview(wav)
+    pos = 12
+    is_pcm16 = False
+    while pos + 8 <= len(wav):
+        chunk_id = wav[pos:pos + 4]
+        (size,) = struct.unpack_from("<I", wav, pos + 4)
+        body = pos + 8
+        if chunk_id == b"fmt " and size >= 16:
+            audio_format, channels, rate, _, _, bits = struct.unpack_from("<HHIIHH", wav, body)
+            is_pcm16 = (audio_format, channels, rate, bits) == (1, 1, _PCM_RATE, 16)
+        elif chunk_id == b"data":
+            return view[body:min(body + size, len(wav))] if is_pcm16 else None
+        pos = body + size + (size & 1)  # 청크는 2바이트 단위로 정렬
+    return None
+
+
+def _to_pcm16(samples: np.ndarray) -> np.ndarray:
+    """
+    float32 신호(-1.0~1.0)를 16-bit PCM으로 양자화
+
+    곱셈/반올림/클리핑을 하나의 작업 버퍼에서 벡터 연산으로 처리하고,
+    int16 배열을 그대로 넘겨 libsndfile의 샘플별 형 변환을 거치지 않게 합니다.
+    """
+    pcm = np.multiply(np.asarray(samples, dtype=np.float32), 32767.0, dtype=np.float32)
+    np.rint(pcm, out=pcm)
+    np.clip(pcm, -32768.0, 32767.0, out=pcm)
+    return pcm.astype(np.int16)
+
+
+def _flac_pcm16(content: bytes) -> Optional[memoryview]:
+    """분할 인식용으로 16kHz mono FLAC(변환 결과 포함)을 16-bit PCM으로 디코딩 (해당하지 않으면 None)"""
+    try:
+        with sf.SoundFile(io.BytesIO(content)) as src:
+            if src.samplerate != _PCM_RATE or src.channels != 1:
+                return None
+            samples = src.read(dtype="int16")
+    except Exception:
+        return None
+    return memoryview(samples).cast("B")
+
+
+def _split_pcm(pcm: memoryview) -> List[memoryview]:
+    """
+    PCM(16-bit mono)을 약 _CHUNK_SEC 단위 구간으로 분할 (복사 없이 memoryview 슬라이스)
+
+    경계는 목표 지점 ±_CHUNK_CUT_SEARCH_SEC 안에서 가장 조용한 20ms 프레임으로 옮겨
+    단어 중간에서 끊기지 않게 하고, 각 구간은 앞 구간 끝을 _CHUNK_OVERLAP_SEC만큼 겹쳐 포함합니다.
+    """
+    # data 청크가 잘렸거나 크기 필드가 틀린 WAV는 홀수 바이트일 수 있으므로 마지막 반쪽 샘플은 버림
+    pcm = pcm[:len(pcm) & ~1]
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    total = len(samples)
+    step = _CHUNK_SEC * _PCM_RATE
+    search = int(_CHUNK_CUT_SEARCH_SEC * _PCM_RATE)
+    overlap = int(_CHUNK_OVERLAP_SEC * _PCM_RATE)
+
+    cuts = [0]
+    # 마지막 구간이 너무 짧아지지 않도록 남은 길이가 구간 길이의 1.5배를 넘을 때만 자름
+    while total - cuts[-1] > step + step // 2:
+        lo = cuts[-1] + step - search
+        window = samples[lo:lo + 2 * search].astype(np.float32)
+        frames = len(window) // _ENERGY_FRAME
+        energy = np.square(window[:frames * _ENERGY_FRAME]).reshape(frames, _ENERGY_FRAME).sum(axis=1)
+        cuts.append(lo + int(energy.argmin()) * _ENERGY_FRAME + _ENERGY_FRAME // 2)
+    cuts.append(total)
+
+    return [pcm[max(0, start - overlap) * 2:end * 2] for start, end in zip(cuts, cuts[1:])]
+
+
+def _merge_transcripts(parts: List[str]) -> str:
+    """구간별 결과를 이어 붙이며 겹친 구간에서 중복 인식된 단어 제거 (앞 구간 끝 == 다음 구간 시작)"""
+    words: List[str] = []
+    for part in parts:
+        part_words = part.split()
+        for k in range(min(8, len(words), len(part_words)), 0, -1):
+            if words[-k:] == part_words[:k]:
+                part_words = part_words[k:]
+                break
+        words.extend(part_words)
+    return " ".join(words)
+
+
+def _response_transcript(response) -> str:
+    """인식 응답의 모든 결과를 합친 텍스트"""
+    return " ".join(
+        [result.alternatives[0].transcript for result in response.results if result.alternatives]
+    )
+
+
+@lru_cache(maxsize=1)
+def get_speech_client() -> speech.SpeechClient:
+    """
+    프로세스 전체에서 공유하는 Google Speech 클라이언트 반환
+
+    파일 업로드 녹취와 스트리밍 녹취가 같은 gRPC 채널을 재사용하여
+    서비스마다 인증/TLS 연결을 새로 맺지 않도록 하고, keepalive로 유휴 연결 끊김을 막습니다.
+    """
+    # Google 서비스 계정 인증 (Sheets/Drive/실시간 Speech와 같은 키 파일 파싱 결과 공유)
+    credentials = google_api.get_credentials(
+        settings.google_application_credentials, google_api.CLOUD_PLATFORM_SCOPES
+    )
+    channel = SpeechGrpcTransport.create_channel(
+        credentials=credentials, options=list(google_api.GRPC_CHANNEL_OPTIONS)
+    )
+    return speech.SpeechClient(transport=SpeechGrpcTransport(channel=channel))
+
+
+@lru_cache(maxsize=1)
+def get_storage_client():
+    """긴 오디오 업로드용 GCS 클라이언트 반환 (SPEECH_GCS_BUCKET 사용 시에만 생성)"""
+    from google.cloud import storage
+
+    credentials = google_api.get_credentials(
+        settings.google_application_credentials, google_api.CLOUD_PLATFORM_SCOPES
+    )
+    return storage.Client(project=credentials.project_id, credentials=credentials)
 
 
 class TranscribeService:
@@ -17,71 +253,286 @@ class TranscribeService:
     def __init__(self):
         self.client = None
 
+        # 동시 인식 요청 수 / 초당 요청 수 제한 (세마포어는 이벤트 루프에서 처음 사용할 때 생성)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_limiter = google_api.TokenBucket(
+            settings.speech_max_concurrency, settings.speech_max_rps
+        )
+        # 인식 작업 대기열과 처리 루프 (이벤트 루프에서 처음 사용할 때 생성)
+        self._jobs: Optional[asyncio.Queue] = None
+        self._pool_task: Optional[asyncio.Task] = None
+
+        # 변환 대기 수 제한 (업로드가 몰려도 변환 원본이 메모리에 무한정 쌓이지 않도록)
+        self._convert_semaphore: Optional[asyncio.Semaphore] = None
+
+        # 원본 해시 -> 변환된 FLAC (LRU, 변환 스레드들이 공유하므로 락으로 보호)
+        self._convert_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._convert_cache_bytes = 0
+        self._convert_cache_lock = threading.Lock()
+
     def _get_client(self):
-        """Google Speech 클라이언트를 lazy initialization으로 생성"""
+        """Google Speech 클라이언트를 lazy initialization으로 가져옴 (프로세스 공유)"""
         if self.client is None:
-            # Google 서비스 계정 인증
-            credentials = service_account.Credentials.from_service_account_file(
-                settings.google_application_credentials
-            )
-            self.client = speech.SpeechClient(credentials=credentials)
+            self.client = get_speech_client()
         return self.client
 
-    def _convert_to_wav(self, audio_content: bytes, source_format: str) -> bytes:
+    async def prewarm(self) -> None:
+        """앱 시작 시 Speech 클라이언트를 미리 생성 (첫 요청의 콜드 스타트 제거)"""
+        try:
+            await asyncio.to_thread(self._get_client)
+            logger.info("Speech API 클라이언트 준비 완료")
+        except Exception as e:
+            logger.warning(f"Speech API 클라이언트 사전 준비 실패 (첫 요청 시 재시도): {e}")
+
+    async def _convert(self, audio_content: bytes, source_format: str) -> bytes:
+        """변환 전용 스레드 풀에서 FLAC 변환 (이벤트 루프 블로킹 방지)"""
+        if self._convert_semaphore is None:
+            self._convert_semaphore = asyncio.Semaphore(_CONVERT_WORKERS * 2)
+        async with self._convert_semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                _convert_pool, self._convert_cached, audio_content, source_format
+            )
+
+    def _convert_cached(self, audio_content: bytes, source_format: str) -> bytes:
+        """원본 내용이 같으면 이전 변환 결과를 재사용하는 _convert_to_flac (변환 스레드에서 실행)"""
+        key = hashlib.blake2b(audio_content, digest_size=16).digest()
+        with self._convert_cache_lock:
+            cached = self._convert_cache.get(key)
+            if cached is not None:
+                self._convert_cache.move_to_end(key)
+                logger.debug("변환 캐시 적중 (%d bytes)", len(cached))
+                return cached
+
+        converted = self._convert_to_flac(audio_content, source_format)
+        if len(converted) > _CONVERT_CACHE_MAX_BYTES:
+            return converted
+
+        with self._convert_cache_lock:
+            if key not in self._convert_cache:
+                self._convert_cache[key] = converted
+                self._convert_cache_bytes += len(converted)
+                while (
+                    len(self._convert_cache) > _CONVERT_CACHE_MAX_ENTRIES
+                    or self._convert_cache_bytes > _CONVERT_CACHE_MAX_BYTES
+                ):
+                    _, evicted = self._convert_cache.popitem(last=False)
+                    self._convert_cache_bytes -= len(evicted)
+        return converted
+
+    def _convert_to_flac(self, audio_content: bytes, source_format: str) -> bytes:
         """
-        오디오 파일을 WAV 형식으로 변환 (librosa 사용)
+        오디오 파일을 16kHz mono 16-bit FLAC으로 변환
+
+        soundfile이 열 수 있는 형식(MP3 등)은 메모리에서 30초 단위 블록으로 디코딩/리샘플링하여
+        임시 파일과 전체 신호 버퍼 없이 변환하고, 그 외(M4A 등)는 librosa로 변환합니다.
 
         Args:
             audio_content: 원본 오디오 바이너리 데이터
             source_format: 원본 파일 형식 (mp3, m4a, ogg 등)
 
         Returns:
-            WAV 형식으로 변환된 바이너리 데이터
+            FLAC 형식으로 변환된 바이너리 데이터
         """
         try:
-            print(f"DEBUG: Converting {source_format} to WAV using librosa...")
+            try:
+                src = sf.SoundFile(io.BytesIO(audio_content))
+            except Exception:
+                # soundfile(libsndfile)이 지원하지 않는 컨테이너
+                return self._convert_with_librosa(audio_content, source_format)
+
+            output = io.BytesIO()
+            with src, sf.SoundFile(
+                output, mode="w", samplerate=16000, channels=1, subtype="PCM_16", format="FLAC"
+            ) as dst:
+                # 블록 사이에 필터 상태를 유지하는 스트리밍 리샘플러 (블록 경계에서 끊김 없음)
+                resampler = None
+                if src.samplerate != 16000:
+                    resampler = soxr.ResampleStream(
+                        src.samplerate, 16000, 1, dtype="float32", quality=_RESAMPLE_QUALITY
+                    )
+
+                for block in src.blocks(blocksize=src.samplerate * 30, dtype="float32", always_2d=True):
+                    mono = block.mean(axis=1)
+                    if resampler is not None:
+                        mono = resampler.resample_chunk(mono)
+                    dst.write(_to_pcm16(mono))
+
+                if resampler is not None:
+                    dst.write(_to_pcm16(resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)))
+
+            flac_content = output.getvalue()
+            output.close()  # 변환 버퍼를 바로 해제 (결과 복사본만 유지)
+            logger.debug("%s -> FLAC 변환 완료: %d bytes", source_format, len(flac_content))
+            return flac_content
 
-            # 임시 파일 생성 (librosa는 파일 경로 필요)
-            with tempfile.NamedTemporaryFile(suffix=f'.{source_format}', delete=False) as input_file:
-                input_path = input_file.name
-                input_file.write(audio_content)
+        except Exception as e:
+            logger.error("오디오 변환 실패 (%s): %s", source_format, e)
+            raise Exception(f"오디오 변환 실패: {str(e)}")
 
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as output_file:
-                output_path = output_file.name
+    def _convert_with_librosa(self, audio_content: bytes, source_format: str) -> bytes:
+        """soundfile이 열 수 없는 형식(M4A 등)을 librosa(audioread)로 디코딩하여 FLAC으로 변환"""
+        # 임시 파일 생성 (audioread는 파일 경로 필요)
+        with tempfile.NamedTemporaryFile(suffix=f'.{source_format}', delete=False) as input_file:
+            input_path = input_file.name
+            input_file.write(audio_content)
 
-            try:
-                # librosa로 오디오 로드 (자동으로 16kHz로 리샘플링)
-                audio_data, sample_rate = librosa.load(input_path, sr=16000, mono=True)
+        try:
+            # librosa로 오디오 로드 (자동으로 16kHz로 리샘플링)
+            audio_data, sample_rate = librosa.load(
+                input_path, sr=16000, mono=True, res_type=f"soxr_{_RESAMPLE_QUALITY.lower()}"
+            )
 
-                print(f"DEBUG: Loaded audio - sample rate: {sample_rate}Hz, duration: {len(audio_data)/sample_rate:.2f}s")
+            logger.debug("librosa 로드 완료: %dHz, %.2f초", sample_rate, len(audio_data) / sample_rate)
 
-                # WAV 파일로 저장 (16-bit PCM)
-                sf.write(output_path, audio_data, sample_rate, subtype='PCM_16')
+            # FLAC으로 저장 (16-bit, 메모리에서 바로)
+            output = io.BytesIO()
+            pcm = _to_pcm16(audio_data)
+            del audio_data  # float32 전체 신호는 양자화 후 바로 해제
+            sf.write(output, pcm, sample_rate, subtype='PCM_16', format='FLAC')
+            flac_content = output.getvalue()
+            output.close()
+            return flac_content
 
-                # 변환된 파일 읽기
-                with open(output_path, 'rb') as f:
-                    wav_content = f.read()
+        finally:
+            # 임시 파일 삭제
+            Path(input_path).unlink(missing_ok=True)
 
-                print(f"DEBUG: Conversion successful. WAV size: {len(wav_content)} bytes")
-                return wav_content
+    async def _call_speech(self, func, *args, **kwargs):
+        """
+        블로킹 Speech API 호출을 스레드에서 실행 (동시 실행 수/속도 제한, 할당량 초과 시 재시도)
 
-            finally:
-                # 임시 파일 삭제
-                Path(input_path).unlink(missing_ok=True)
-                Path(output_path).unlink(missing_ok=True)
+        Args:
+            func: client.recognize 등을 호출하는 동기 함수
+            *args, **kwargs: func 인자
 
-        except Exception as e:
-            print(f"ERROR: Audio conversion failed: {str(e)}")
-            raise Exception(f"오디오 변환 실패: {str(e)}")
+        Returns:
+            func 반환값
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.speech_max_concurrency)
+
+        async with self._semaphore:
+            for attempt in range(_SPEECH_MAX_ATTEMPTS):
+                await self._rate_limiter.acquire()
+                try:
+                    response = await asyncio.to_thread(func, *args, **kwargs)
+                except _SPEECH_RETRYABLE as e:
+                    if isinstance(e, gapi_exceptions.ResourceExhausted):
+                        self._rate_limiter.on_throttled()
+                    if attempt == _SPEECH_MAX_ATTEMPTS - 1:
+                        raise
+                    delay = min(_SPEECH_RETRY_MAX_SEC, _SPEECH_RETRY_MIN_SEC * (2 ** attempt))
+                    logger.warning(f"Speech API 일시 오류 ({type(e).__name__}), {delay:.1f}초 후 재시도")
+                    await asyncio.sleep(delay)
+                    continue
+
+                self._rate_limiter.on_success()
+                return response
+
+    async def _recognize_chunks(self, client, config, pcm: memoryview) -> str:
+        """긴 PCM 오디오를 구간별로 병렬 인식하고 순서대로 이어 붙인 텍스트 반환 (config는 LINEAR16, 헤더 없는 PCM 허용)"""
+        chunks = _split_pcm(pcm)
+        logger.debug("%d개 구간 병렬 인식", len(chunks))
+
+        # 구간은 원본을 가리키는 memoryview로 넘기고 요청 객체는 호출 스레드에서 만들므로,
+        # 구간 복사본은 동시에 실행 중인 요청 수만큼만 메모리에 존재
+        responses = await asyncio.gather(*[
+            self._call_speech(self._recognize, client, config, chunk) for chunk in chunks
+        ])
+        return _merge_transcripts([_response_transcript(response) for response in responses])
+
+    @staticmethod
+    def _audio_duration(content: bytes) -> Optional[float]:
+        """
+        오디오 길이(초) 계산 (알 수 없으면 None)
+
+        soundfile이 읽을 수 있는 형식(WAV/FLAC/OGG, 변환된 FLAC 포함)만 헤더에서 읽습니다.
+        """
+        try:
+            return sf.info(io.BytesIO(content)).duration
+        except Exception:
+            return None
+
+    def _recognize(self, client, config, content):
+        """
+        recognize로 오디오 인식 (블로킹, 스레드에서 실행)
+
+        RecognitionAudio는 오디오를 한 번 더 복사하므로 실제 호출 직전에 만들고
+        호출이 끝나면 바로 해제합니다. content는 bytes 또는 memoryview 구간입니다.
+        """
+        if isinstance(content, memoryview):
+            content = content.tobytes()
+        audio = speech.RecognitionAudio(content=content)
+        del content
+        return client.recognize(config=config, audio=audio)
+
+    @staticmethod
+    def _upload_audio(content: bytes):
+        """
+        인라인 한도를 넘는 오디오를 SPEECH_GCS_BUCKET에 업로드 (블로킹, 스레드에서 실행)
+
+        8MB 단위 재개 가능(resumable) 업로드로 보내므로 일시적인 오류가 나도
+        처음부터 다시 보내지 않고 실패한 구간부터 이어서 전송합니다.
+        """
+        if not settings.speech_gcs_bucket:
+            raise Exception(
+                "오디오가 너무 큽니다 (10MB 초과). 긴 오디오를 처리하려면 SPEECH_GCS_BUCKET을 설정하세요."
+            )
+        blob = get_storage_client().bucket(settings.speech_gcs_bucket).blob(
+            f"transcribe/{uuid.uuid4().hex}", chunk_size=_GCS_UPLOAD_CHUNK_BYTES
+        )
+        blob.upload_from_file(
+            io.BytesIO(content),
+            size=len(content),
+            content_type="application/octet-stream",
+            checksum="md5",
+            timeout=_GCS_UPLOAD_TIMEOUT_SEC,
+        )
+        return blob
+
+    async def _long_running_recognize(self, client, config, content: bytes):
+        """
+        long_running_recognize로 긴 오디오 인식
+
+        10MB를 넘는 오디오는 인라인으로 보낼 수 없으므로 SPEECH_GCS_BUCKET에 올린 뒤
+        gs:// URI로 요청하고, 결과를 받으면 업로드한 파일을 삭제합니다.
+        작업 시작 요청만 동시 실행/속도 제한을 받고, 완료 대기는 이벤트 루프에서 주기적으로 확인하므로
+        인식이 진행되는 동안 스레드와 동시 실행 슬롯을 점유하지 않습니다.
+        """
+        blob = None
+        if len(content) > _INLINE_MAX_BYTES:
+            blob = await asyncio.to_thread(self._upload_audio, content)
+            audio = speech.RecognitionAudio(uri=f"gs://{settings.speech_gcs_bucket}/{blob.name}")
+        else:
+            audio = speech.RecognitionAudio(content=content)
+
+        try:
+            operation = await self._call_speech(client.long_running_recognize, config=config, audio=audio)
+            del audio
+
+            deadline = asyncio.get_running_loop().time() + _LONG_RUNNING_TIMEOUT_SEC
+            while not await asyncio.to_thread(operation.done):
+                if asyncio.get_running_loop().time() >= deadline:
+                    raise Exception(f"long_running_recognize 시간 초과 ({_LONG_RUNNING_TIMEOUT_SEC}초)")
+                await asyncio.sleep(_LONG_RUNNING_POLL_SEC)
+            return operation.result()
+        finally:
+            if blob is not None:
+                try:
+                    await asyncio.to_thread(blob.delete)
+                except Exception as e:
+                    logger.warning(f"GCS 임시 오디오 삭제 실패: {blob.name} ({e})")
 
     async def transcribe_audio(
-        self, audio_file: BinaryIO, language: Optional[str] = "ko", filename: Optional[str] = None
+        self, audio_content: bytes, language: Optional[str] = "ko", filename: Optional[str] = None
     ) -> str:
         """
         음성 파일을 텍스트로 변환
 
+        요청은 프로세스 공용 작업 대기열에 들어가고, 대기열 처리 루프가 순서대로 실행합니다.
+
         Args:
-            audio_file: 업로드된 오디오 파일 객체
+            audio_content: 업로드된 오디오 바이너리 데이터
             language: 음성 언어 코드 (기본값: ko, 영어는 en-US)
             filename: 파일명 (인코딩 감지용, 선택 사항)
 
@@ -91,98 +542,123 @@ class TranscribeService:
         Raises:
             Exception: API 호출 실패 시
         """
+        if self._jobs is None:
+            self._jobs = asyncio.Queue()
+            self._pool_task = asyncio.create_task(self._run_pool())
+
+        future = asyncio.get_running_loop().create_future()
+        self._jobs.put_nowait((audio_content, language, filename, future))
+        return await future
+
+    async def _run_pool(self) -> None:
+        """
+        작업 대기열 처리 루프 (프로세스당 하나)
+
+        작업은 들어온 순서(FIFO)대로 시작합니다. 여기서 제한하는 동시 작업 수
+        (SPEECH_MAX_CONCURRENCY의 2배)는 원본/변환 결과를 들고 있는 작업 수를 묶어 메모리를 보호하기 위한
+        것이고, Speech API 동시 호출 수와 호출 속도는 _call_speech의 세마포어와 토큰 버킷이,
+        변환 동시 실행 수는 변환 스레드 풀과 _convert_semaphore가 결정합니다.
+        """
+        active = asyncio.Semaphore(settings.speech_max_concurrency * 2)
+        while True:
+            audio_content, language, filename, future = await self._jobs.get()
+            if future.done():
+                # 대기 중에 요청이 취소됨 (클라이언트 연결 종료 등)
+                continue
+            await active.acquire()
+            task = asyncio.create_task(self._run_job(audio_content, language, filename, future))
+            task.add_done_callback(lambda _: active.release())
+            # 요청이 취소되면 실행 중인 작업도 취소
+            future.add_done_callback(lambda f, task=task: task.cancel() if f.cancelled() else None)
+
+    async def _run_job(self, audio_content: bytes, language: Optional[str], filename: Optional[str], future) -> None:
+        """대기열 작업 하나를 실행하고 결과를 요청 쪽 future로 전달"""
+        try:
+            result = await self._transcribe(audio_content, language, filename)
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def _transcribe(self, audio_content: bytes, language: Optional[str], filename: Optional[str]) -> str:
+        """transcribe_audio 실제 처리 (대기열 처리 루프에서 실행)"""
         try:
             client = self._get_client()
 
-            # 오디오 파일 읽기
-            content = audio_file.read()
-
-            print(f"DEBUG: Original audio content size: {len(content)} bytes")
-            print(f"DEBUG: Filename: {filename}")
-
-            # 언어 코드 매핑 (ko -> ko-KR, en -> en-US)
-            language_code_map = {
-                "ko": "ko-KR",
-                "en": "en-US",
-                "ja": "ja-JP",
-                "zh": "zh-CN",
-            }
-            language_code = language_code_map.get(language, f"{language}-KR")
-
-            # 파일 확장자 기반 처리
-            encoding = speech.RecognitionConfig.AudioEncoding.LINEAR16
-            needs_conversion = False
-            source_format = None
-
-            if filename:
-                filename_lower = filename.lower()
-                # MP3, M4A 등은 WAV로 변환 필요
-                if filename_lower.endswith('.mp3'):
-                    needs_conversion = True
-                    source_format = 'mp3'
-                elif filename_lower.endswith('.m4a'):
-                    needs_conversion = True
-                    source_format = 'm4a'
-                elif filename_lower.endswith('.wav'):
-                    encoding = speech.RecognitionConfig.AudioEncoding.LINEAR16
-                elif filename_lower.endswith('.flac'):
-                    encoding = speech.RecognitionConfig.AudioEncoding.FLAC
-                elif filename_lower.endswith('.ogg'):
-                    encoding = speech.RecognitionConfig.AudioEncoding.OGG_OPUS
-                elif filename_lower.endswith('.webm'):
-                    encoding = speech.RecognitionConfig.AudioEncoding.WEBM_OPUS
-
-            # MP3/M4A를 WAV로 변환
+            content = audio_content
+
+            language_code = resolve_language_code(language)
+
+            # 파일 확장자 기반 처리 (MP3, M4A 등은 FLAC으로 변환 필요)
+            ext = os.path.splitext(filename or "")[1].lower()
+            encoding, source_format = _EXT_ENCODINGS.get(ext, _DEFAULT_ENCODING)
+
+            # 16kHz mono 16-bit PCM WAV는 그대로 전송하고, 그 외 WAV(44.1kHz, 스테레오 등)는
+            # 설정과 샘플링 레이트가 달라 인식에 실패하므로 FLAC으로 변환 (soundfile 블록 변환, librosa 미사용)
+            if ext == ".wav" and _pcm16_payload(content) is None:
+                encoding, source_format = _Encoding.FLAC, "wav"
+            needs_conversion = source_format is not None
+
+            # MP3/M4A를 FLAC으로 변환
             if needs_conversion:
-                print(f"DEBUG: Converting {source_format} to WAV for better compatibility...")
-                content = self._convert_to_wav(content, source_format)
-                encoding = speech.RecognitionConfig.AudioEncoding.LINEAR16
+                content = await self._convert(content, source_format)
 
-            print(f"DEBUG: Using encoding: {encoding}")
-            print(f"DEBUG: Language code: {language_code}")
-            print(f"DEBUG: Final audio size: {len(content)} bytes")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "음성 인식 요청: %s (원본 %d bytes -> %d bytes, %s, %s)",
+                    filename, len(audio_content), len(content), _Encoding(encoding).name, language_code,
+                )
 
-            # Google Speech-to-Text 설정
-            audio = speech.RecognitionAudio(content=content)
+            # 16kHz PCM WAV는 헤더를 직접 파싱해 길이 계산 (libsndfile을 거치지 않고, 분할 인식에도 재사용)
+            pcm = _pcm16_payload(content) if encoding == _Encoding.LINEAR16 else None
+            if pcm is not None:
+                duration = len(pcm) / (_PCM_RATE * 2)
+            else:
+                duration = self._audio_duration(content)
 
-            # 오디오 인코딩 설정
-            config = speech.RecognitionConfig(
-                encoding=encoding,
-                sample_rate_hertz=16000,  # WAV 변환 시 16kHz로 설정
-                language_code=language_code,
-                enable_automatic_punctuation=True,  # 자동 문장 부호
-                model="default",  # 기본 모델
-                use_enhanced=False,  # 향상된 모델 사용 (비용 발생)
+            # 길이/크기가 recognize 한도를 넘으면 long_running_recognize 사용
+            use_long_running = len(content) > _INLINE_MAX_BYTES or (
+                duration is not None and duration > _INLINE_MAX_DURATION_SEC
             )
 
-            # 음성 인식 수행
-            print("DEBUG: Calling Speech-to-Text API...")
-            response = client.recognize(config=config, audio=audio)
-
-            # 디버깅: 응답 확인
-            print(f"DEBUG: Speech API response received")
-            print(f"DEBUG: Number of results: {len(response.results)}")
+            # 오디오 인코딩 설정 (인코딩/언어 조합별로 한 번만 생성)
+            config = _recognition_config(encoding, language_code)
 
-            # 결과 추출
-            if not response.results:
-                print("WARNING: No results from Speech API - 오디오가 너무 짧거나, 인식 가능한 음성이 없거나, 인코딩 문제일 수 있습니다.")
+            # 음성 인식 수행
+            if use_long_running and encoding == _Encoding.FLAC:
+                # FLAC은 PCM으로 디코딩해야 분할할 수 있으므로 변환 스레드 풀에서 실행
+                pcm = await asyncio.get_running_loop().run_in_executor(_convert_pool, _flac_pcm16, content)
+            if use_long_running and pcm is not None:
+                # 16kHz PCM은 약 30초 구간으로 나눠 recognize를 병렬 호출 (동시 실행 수는 세마포어가 제한)
+                transcript = await self._recognize_chunks(
+                    client, _recognition_config(_Encoding.LINEAR16, language_code), pcm
+                )
+            elif use_long_running:
+                # 수 분 걸릴 수 있으므로 이벤트 루프에서 완료 여부를 주기적으로 확인
+                response = await self._long_running_recognize(client, config, content)
+                transcript = _response_transcript(response)
+            else:
+                response = await self._call_speech(self._recognize, client, config, content)
+                transcript = _response_transcript(response)
+
+            # 결과 확인
+            if not transcript:
+                logger.warning("Speech API 결과 없음 - 오디오가 너무 짧거나, 인식 가능한 음성이 없거나, 인코딩 문제일 수 있습니다.")
                 # 빈 결과 대신 의미 있는 에러 메시지 반환
                 raise Exception(
                     "음성 인식 결과 없음: 오디오 파일이 너무 짧거나 음성이 명확하지 않을 수 있습니다. "
                     "파일 형식과 품질을 확인해주세요."
                 )
 
-            # 모든 결과를 합쳐서 반환
-            transcript = " ".join(
-                [result.alternatives[0].transcript for result in response.results]
-            )
-
-            print(f"DEBUG: Transcription success: {transcript}")
+            logger.debug("음성 인식 완료: %d자", len(transcript))
             return transcript
 
         except Exception as e:
-            print(f"ERROR: Exception occurred: {str(e)}")
-            print(f"ERROR: Exception type: {type(e).__name__}")
+            logger.error("음성 인식 실패 (%s): %s", type(e).__name__, e)
             raise Exception(f"음성 인식 실패: {str(e)}")
 
 
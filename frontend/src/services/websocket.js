@@ -14,6 +14,7 @@ class WebSocketService {
       transcription_recorded: [],  // 추가: 화자 정보 포함된 녹취 기록
       speaker_mapping_required: [],  // 추가: 화자 매핑 요청
       speaker_mapped: [],  // 추가: 화자 매핑 완료
+      speakers_reset: [],  // 음성 인식 스트림 교체로 화자 매핑 초기화
       completed: [],
       error: [],
     };
@@ -169,14 +170,15 @@ class WebSocketService {
   }
 
   /**
-   * 오디오 데이터 전송 (Base64)
-   * @param {string} audioBase64 - Base64 인코딩된 오디오 데이터
+   * 오디오 데이터 전송 (바이너리 프레임, Base64 인코딩 없음)
+   * @param {Blob|ArrayBuffer} audioData - MediaRecorder가 생성한 오디오 청크
    */
-  sendAudio(audioBase64) {
-    this.send({
-      type: 'audio',
-      data: audioBase64,
-    });
+  sendAudio(audioData) {
+    if (!this.isConnected) {
+      throw new Error('WebSocket이 연결되지 않았습니다');
+    }
+
+    this.ws.send(audioData);
   }
 
 
@@ -184,12 +186,14 @@ class WebSocketService {
    * 화자 매핑 전송
    * @param {number} speakerId - Speaker ID
    * @param {string} speakerName - 화자 이름
+   * @param {number} stream - 매핑 요청을 받은 음성 인식 스트림 순번
    */
-  sendSpeakerMapping(speakerId, speakerName) {
+  sendSpeakerMapping(speakerId, speakerName, stream) {
     this.send({
       type: 'speaker_mapping',
       speaker_id: speakerId,
       speaker_name: speakerName,
+      stream,
     });
   }
 